@@ -1,5 +1,6 @@
 import pygame
 import random
+from GameOfLifeCycles import create_cycle_tracker, advance_generation
 
 # ----------------------------
 # Settings
@@ -27,6 +28,7 @@ TEAM_COLORS = {
     "Blue": (0, 100, 255),
     "Green": (0, 200, 0)
 }
+TEAM_CODES = {"Blue": 1, "Green": 2}
 BACKGROUND_COLOR = (10, 10, 30)
 
 # Fade and transition settings
@@ -44,6 +46,9 @@ SEED = 42
 # Font settings
 SCORE_FONT_SIZE = 24
 
+# Cycle detection: generations of logic-state hashes kept to spot still lifes/oscillators
+CYCLE_HISTORY = 64
+
 pygame.init()
 pygame.font.init()
 font = pygame.font.SysFont("Arial", SCORE_FONT_SIZE)
@@ -247,6 +252,7 @@ def main():
     initialize_seed(SEED)
 
     grid = create_grid()
+    cycle = create_cycle_tracker(next_generation, TEAM_CODES, CYCLE_HISTORY)
     clock = pygame.time.Clock()
 
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -262,7 +268,7 @@ def main():
                 running = False
 
         # Compute next generation
-        grid = next_generation(grid)
+        grid = advance_generation(grid, cycle)
 
         # Smooth transitions
         update_visuals(grid)
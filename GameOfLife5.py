@@ -1,5 +1,7 @@
 import pygame
 import random
+import numpy as np
+from GameOfLifeCycles import create_cycle_tracker, advance_generation as tracked_generation
 
 # ----------------------------
 # Settings
@@ -25,6 +27,7 @@ TEAM_COLORS = {
     "Blue": (0, 100, 255),
     "Green": (0, 200, 0)
 }
+TEAM_CODES = {"Blue": 1, "Green": 2}
 BACKGROUND_COLOR = (10, 10, 30)
 
 FADE_SPEED = 0.15
@@ -40,6 +43,9 @@ COLOR_DRIFT_CHANCE = 0.000005
 SEED = 69
 SCORE_FONT_SIZE = 24
 
+# Cycle detection: generations of logic-state hashes kept to spot still lifes/oscillators
+CYCLE_HISTORY = 64
+
 # Timing variables:
 START_DELAY_SECONDS = 2      # Show initial state for 2 seconds
 CALM_DOWN_TIME_SECONDS = 10  # After 20 seconds, no more toggling/drifting
@@ -50,6 +56,21 @@ font = pygame.font.SysFont("Arial", SCORE_FONT_SIZE)
 
 def initialize_seed(seed):
     random.seed(seed)
+    return create_streams(seed)
+
+def create_streams(seed):
+    # One independent numpy Generator per purpose, all derived from the seed,
+    # so a change in how often one of them is drawn never shifts the others
+    births, toggles, drifts = (np.random.default_rng(child)
+                               for child in np.random.SeedSequence(seed).spawn(3))
+    return {"births": births, "toggles": toggles, "drifts": drifts}
+
+def sample_cells(rng, rate):
+    # Indices of the cells hit by an event with the given per-cell rate: the number
+    # of hits is one binomial draw, instead of one Bernoulli trial per cell
+    cell_count = GRID_WIDTH * GRID_HEIGHT
+    hits = rng.binomial(cell_count, rate)
+    return rng.choice(cell_count, size=hits, replace=False)
 
 def create_grid():
     grid = []
@@ -89,7 +110,7 @@ def count_neighbors(grid, x, y):
                     team_counts[neigh["team"]] += 1
     return alive_count, team_counts
 
-def determine_team_on_birth(team_counts):
+def determine_team_on_birth(team_counts, rng):
     blue_n = team_counts["Blue"]
     green_n = team_counts["Green"]
     if blue_n > green_n:
@@ -97,12 +118,12 @@ def determine_team_on_birth(team_counts):
     elif green_n > blue_n:
         return "Green"
     else:
-        return random.choice(["Blue", "Green"])
+        return "Blue" if rng.random() < 0.5 else "Green"
 
 def color_distance(c1, c2):
     return abs(c1[0]-c2[0]) + abs(c1[1]-c2[1]) + abs(c1[2]-c2[2])
 
-def next_generation(grid, chaos_enabled):
+def next_generation(grid, chaos_enabled, streams):
     new_grid = [[None for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
 
     for y in range(GRID_HEIGHT):
@@ -123,7 +144,7 @@ def next_generation(grid, chaos_enabled):
                 if was_alive:
                     team = my_team
                 else:
-                    team = determine_team_on_birth(team_counts)
+                    team = determine_team_on_birth(team_counts, streams["births"])
                 color_target = TEAM_COLORS[team]
                 state_factor_target = 1.0
             else:
@@ -159,39 +180,48 @@ def next_generation(grid, chaos_enabled):
 
     if chaos_enabled:
         # Random toggling
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                if random.random() < RANDOM_TOGGLE_RATE:
-                    c = new_grid[y][x]
-                    if c["alive"]:
-                        # kill cell
-                        c["alive"] = False
-                        c["team"] = None
-                        c["color_target"] = BACKGROUND_COLOR
-                        c["state_factor_target"] = 0.0
-                    else:
-                        # spawn cell
-                        team = random.choice(["Blue", "Green"])
-                        c["alive"] = True
-                        c["team"] = team
-                        c["color_target"] = TEAM_COLORS[team]
-                        c["state_factor_target"] = 1.0
-
-        # Color drift
-        for y in range(GRID_HEIGHT):
-            for x in range(GRID_WIDTH):
-                c = new_grid[y][x]
-                if c["alive"] and c["team"] is not None:
-                    if random.random() < COLOR_DRIFT_CHANCE:
-                        opp_team = "Blue" if c["team"] == "Green" else "Green"
-                        rt, gt, bt = TEAM_COLORS[opp_team]
-                        ct = c["color_target"]
-                        c["color_target"] = ((ct[0]+rt)/2, (ct[1]+gt)/2, (ct[2]+bt)/2)
-                        if color_distance(c["color_target"], TEAM_COLORS[opp_team]) < 40:
-                            c["team"] = opp_team
+        toggled = sample_cells(streams["toggles"], RANDOM_TOGGLE_RATE)
+        spawn_green = streams["toggles"].random(len(toggled)) < 0.5
+        for index, green in zip(toggled, spawn_green):
+            y, x = divmod(int(index), GRID_WIDTH)
+            c = new_grid[y][x]
+            if c["alive"]:
+                # kill cell
+                c["alive"] = False
+                c["team"] = None
+                c["color_target"] = BACKGROUND_COLOR
+                c["state_factor_target"] = 0.0
+            else:
+                # spawn cell
+                team = "Green" if green else "Blue"
+                c["alive"] = True
+                c["team"] = team
+                c["color_target"] = TEAM_COLORS[team]
+                c["state_factor_target"] = 1.0
+
+        # Color drift (hits on dead cells are dropped, as if only live cells were rolled)
+        for index in sample_cells(streams["drifts"], COLOR_DRIFT_CHANCE):
+            y, x = divmod(int(index), GRID_WIDTH)
+            c = new_grid[y][x]
+            if c["alive"] and c["team"] is not None:
+                opp_team = "Blue" if c["team"] == "Green" else "Green"
+                rt, gt, bt = TEAM_COLORS[opp_team]
+                ct = c["color_target"]
+                c["color_target"] = ((ct[0]+rt)/2, (ct[1]+gt)/2, (ct[2]+bt)/2)
+                if color_distance(c["color_target"], TEAM_COLORS[opp_team]) < 40:
+                    c["team"] = opp_team
 
     return new_grid
 
+def advance_generation(grid, cycle, chaos_enabled, streams):
+    # The cycle-tracked generation (GameOfLifeCycles), except while chaos is on:
+    # random toggles break any cycle, so tracking only starts once chaos is off
+    if chaos_enabled:
+        cycle["generation"] += 1
+        cycle["history"].clear()
+        return next_generation(grid, True, streams)
+    return tracked_generation(grid, cycle)
+
 def interpolate_values(cell):
     sc = cell["state_factor_current"]
     st = cell["state_factor_target"]
@@ -252,8 +282,10 @@ def render_text_with_border(screen, text, font, color, x, y):
     screen.blit(text_surface, (x, y))
 
 def main():
-    initialize_seed(SEED)
+    streams = initialize_seed(SEED)
     grid = create_grid()
+    cycle = create_cycle_tracker(lambda grid: next_generation(grid, False, streams),
+                                 TEAM_CODES, CYCLE_HISTORY)
     clock = pygame.time.Clock()
 
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
@@ -277,7 +309,7 @@ def main():
         # Update the simulation only after the start delay
         if time_elapsed > START_DELAY_SECONDS:
             # Evolve
-            grid = next_generation(grid, chaos_enabled)
+            grid = advance_generation(grid, cycle, chaos_enabled, streams)
 
         update_visuals(grid)
         draw_grid(render_surface, grid)
@@ -1,6 +1,9 @@
 import pygame
 import random
 import math
+import numpy as np
+
+from GameOfLifePacked import place_clusters
 
 # ----------------------------
 # Settings
@@ -26,6 +29,7 @@ TEAM_COLORS = {
     "Blue": (0, 100, 255),
     "Green": (0, 200, 0)
 }
+TEAM_CODES = {None: 0, "Blue": 1, "Green": 2}  # Per-cell team array encoding
 BACKGROUND_COLOR = (10, 10, 30)
 
 FADE_SPEED = 0.25         # Speed of fade in/out
@@ -33,6 +37,10 @@ COLOR_BLEND_SPEED = 0.37  # Speed of color transitions
 
 CONVERSION_THRESHOLD = 4  # Aggressiveness for color conversions
 
+# A cell counts as settled once it is this close to its targets
+STABLE_COLOR_EPSILON = 1.0
+STABLE_FACTOR_EPSILON = 0.01
+
 # Chaos probabilities:
 # During the main battle, we'll start with these base rates.
 INITIAL_TOGGLE_RATE = 0.009
@@ -58,13 +66,17 @@ CALM_END   = BATTLE_END + CALM_DOWN_DURATION
 
 
 def initialize_seed(seed):
+    """Set random seed and return the batch generator used for chaos draws."""
     random.seed(seed)
+    return np.random.default_rng(seed)
 
 
-def create_grid(num_particles):
+def create_grid(num_particles, rng):
     """
     Create an empty grid, then place exactly num_particles cells
     in small random clusters of size 2-4. Half Blue, half Green.
+    Placement runs on flat arrays (see place_clusters), so it stays
+    fast however dense the starting board is.
     """
     grid = []
     for _ in range(GRID_HEIGHT):
@@ -84,25 +96,6 @@ def create_grid(num_particles):
     blue_count = num_particles // 2
     green_count = num_particles - blue_count
 
-    def expand_cluster(positions):
-        """Pick an empty neighbor around the cluster to expand."""
-        candidates = []
-        for (px, py) in positions:
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    if dx == 0 and dy == 0:
-                        continue
-                    nx, ny = px + dx, py + dy
-                    if 0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT:
-                        if not grid[ny][nx]["alive"]:
-                            candidates.append((nx, ny))
-        random.shuffle(candidates)
-        for (cx, cy) in candidates:
-            if (cx, cy) not in positions:
-                positions.append((cx, cy))
-                return positions
-        return positions
-
     def set_cell_alive(x, y, team):
         grid[y][x]["alive"] = True
         grid[y][x]["team"] = team
@@ -111,41 +104,10 @@ def create_grid(num_particles):
         grid[y][x]["state_factor_current"] = 1.0
         grid[y][x]["state_factor_target"] = 1.0
 
-    def place_cluster(team, cluster_size):
-        attempts = 0
-        placed_positions = []
-        while attempts < 100:
-            attempts += 1
-            sx = random.randint(0, GRID_WIDTH - 1)
-            sy = random.randint(0, GRID_HEIGHT - 1)
-            if not grid[sy][sx]["alive"]:
-                placed_positions = [(sx, sy)]
-                for _ in range(cluster_size - 1):
-                    placed_positions = expand_cluster(placed_positions)
-                if len(placed_positions) == cluster_size:
-                    break
-                else:
-                    placed_positions = []
-
-        for (x, y) in placed_positions:
-            set_cell_alive(x, y, team)
-        return len(placed_positions)
-
-    # Place Blue clusters
-    to_place_blue = blue_count
-    while to_place_blue > 0:
-        csize = random.randint(2, 4)
-        csize = min(csize, to_place_blue)
-        placed = place_cluster("Blue", csize)
-        to_place_blue -= placed
-
-    # Place Green clusters
-    to_place_green = green_count
-    while to_place_green > 0:
-        csize = random.randint(2, 4)
-        csize = min(csize, to_place_green)
-        placed = place_cluster("Green", csize)
-        to_place_green -= placed
+    placed = place_clusters(GRID_WIDTH, GRID_HEIGHT, (blue_count, green_count), rng)
+    for team, cells in zip(("Blue", "Green"), placed):
+        for y, x in zip(*np.divmod(cells, GRID_WIDTH)):
+            set_cell_alive(int(x), int(y), team)
 
     return grid
 
@@ -171,21 +133,16 @@ def count_neighbors(grid, x, y):
     return alive_count, team_counts
 
 
-def is_border_cell(grid, x, y):
-    """A cell is a border if it has at least one neighbor of the opposite team."""
-    if not grid[y][x]["alive"]:
-        return False
-    my_team = grid[y][x]["team"]
-    if my_team is None:
-        return False
-    opp_team = "Blue" if my_team == "Green" else "Green"
+def border_mask(teams):
+    """Alive cells with at least one neighbor of the opposite team, from shifted team arrays."""
+    blue = np.pad(teams == TEAM_CODES["Blue"], 1)
+    green = np.pad(teams == TEAM_CODES["Green"], 1)
+    near_blue = np.zeros(teams.shape, dtype=bool)
+    near_green = np.zeros(teams.shape, dtype=bool)
     for dx, dy in NEIGHBOR_OFFSETS:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT:
-            neigh = grid[ny][nx]
-            if neigh["alive"] and neigh["team"] == opp_team:
-                return True
-    return False
+        near_blue |= blue[1 + dy:1 + dy + GRID_HEIGHT, 1 + dx:1 + dx + GRID_WIDTH]
+        near_green |= green[1 + dy:1 + dy + GRID_HEIGHT, 1 + dx:1 + dx + GRID_WIDTH]
+    return (blue[1:-1, 1:-1] & near_green) | (green[1:-1, 1:-1] & near_blue)
 
 
 def color_distance(c1, c2):
@@ -203,11 +160,44 @@ def determine_team_on_birth(team_counts):
         return random.choice(["Blue", "Green"])
 
 
-def game_of_life_step(grid):
+def is_cell_settled(cell):
+    """True once a cell's fade factor and color have reached their targets."""
+    if abs(cell["state_factor_current"] - cell["state_factor_target"]) > STABLE_FACTOR_EPSILON:
+        return False
+    cc, ct = cell["color_current"], cell["color_target"]
+    return (abs(cc[0] - ct[0]) <= STABLE_COLOR_EPSILON and
+            abs(cc[1] - ct[1]) <= STABLE_COLOR_EPSILON and
+            abs(cc[2] - ct[2]) <= STABLE_COLOR_EPSILON)
+
+
+def create_tracker(grid):
+    """
+    Bookkeeping kept next to the grid so the per-frame checks stay O(1):
+    the positions of cells still converging, the live score per team and
+    the team array (TEAM_CODES) of the live cells.
+    """
+    tracker = {"converging": set(), "scores": {"Blue": 0, "Green": 0},
+               "teams": np.zeros((GRID_HEIGHT, GRID_WIDTH), dtype=np.uint8)}
+    for y in range(GRID_HEIGHT):
+        for x in range(GRID_WIDTH):
+            c = grid[y][x]
+            if not is_cell_settled(c):
+                tracker["converging"].add((x, y))
+            if c["alive"] and c["team"]:
+                tracker["scores"][c["team"]] += 1
+                tracker["teams"][y, x] = TEAM_CODES[c["team"]]
+    return tracker
+
+
+def game_of_life_step(grid, tracker):
     """
     Standard GoL update + conversion threshold (no toggles/drifts).
+    Rebuilds the tracker as every cell is visited anyway.
     """
     new_grid = [[None for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+    converging = set()
+    scores = {"Blue": 0, "Green": 0}
+    teams = bytearray(GRID_WIDTH * GRID_HEIGHT)
 
     for y in range(GRID_HEIGHT):
         for x in range(GRID_WIDTH):
@@ -259,35 +249,58 @@ def game_of_life_step(grid):
                         new_cell["team"] = opp_team
 
             new_grid[y][x] = new_cell
-
+            if not is_cell_settled(new_cell):
+                converging.add((x, y))
+            if will_live and new_cell["team"]:
+                scores[new_cell["team"]] += 1
+                teams[y * GRID_WIDTH + x] = TEAM_CODES[new_cell["team"]]
+
+    tracker["converging"] = converging
+    tracker["scores"] = scores
+    tracker["teams"] = np.frombuffer(teams, dtype=np.uint8).reshape(GRID_HEIGHT, GRID_WIDTH)
     return new_grid
 
 
-def apply_chaos(grid, toggle_rate, drift_rate):
+def apply_chaos(grid, tracker, rng, toggle_rate, drift_rate):
     """
     Border toggles + border drifts, with specified rates.
+    Border cells come from the team array in one pass and all of their
+    toggle/drift rolls are one batch draw, so only the hits touch the grid.
     """
-    for y in range(GRID_HEIGHT):
-        for x in range(GRID_WIDTH):
-            c = grid[y][x]
-            if c["alive"] and c["team"] is not None and is_border_cell(grid, x, y):
-                # Instant team flip
-                if random.random() < toggle_rate:
-                    opp_team = "Blue" if c["team"] == "Green" else "Green"
-                    c["team"] = opp_team
-                    c["color_target"] = TEAM_COLORS[opp_team]
-                # Color drift
-                if random.random() < drift_rate:
-                    opp_team = "Blue" if c["team"] == "Green" else "Green"
-                    rt, gt, bt = TEAM_COLORS[opp_team]
-                    ct = c["color_target"]
-                    c["color_target"] = (
-                        (ct[0] + rt) / 2,
-                        (ct[1] + gt) / 2,
-                        (ct[2] + bt) / 2
-                    )
-                    if color_distance(c["color_target"], TEAM_COLORS[opp_team]) < 40:
-                        c["team"] = opp_team
+    scores = tracker["scores"]
+    teams = tracker["teams"]
+    ys, xs = np.nonzero(border_mask(teams))
+    rolls = rng.random((2, len(ys)))
+    toggles = rolls[0] < toggle_rate
+    drifts = rolls[1] < drift_rate
+    for i in np.flatnonzero(toggles | drifts):
+        x, y = int(xs[i]), int(ys[i])
+        c = grid[y][x]
+        # Instant team flip
+        if toggles[i]:
+            opp_team = "Blue" if c["team"] == "Green" else "Green"
+            scores[c["team"]] -= 1
+            scores[opp_team] += 1
+            c["team"] = opp_team
+            c["color_target"] = TEAM_COLORS[opp_team]
+            teams[y, x] = TEAM_CODES[opp_team]
+            tracker["converging"].add((x, y))
+        # Color drift
+        if drifts[i]:
+            opp_team = "Blue" if c["team"] == "Green" else "Green"
+            rt, gt, bt = TEAM_COLORS[opp_team]
+            ct = c["color_target"]
+            c["color_target"] = (
+                (ct[0] + rt) / 2,
+                (ct[1] + gt) / 2,
+                (ct[2] + bt) / 2
+            )
+            tracker["converging"].add((x, y))
+            if color_distance(c["color_target"], TEAM_COLORS[opp_team]) < 40:
+                scores[c["team"]] -= 1
+                scores[opp_team] += 1
+                c["team"] = opp_team
+                teams[y, x] = TEAM_CODES[opp_team]
 
 
 def interpolate_values(cell):
@@ -309,10 +322,16 @@ def interpolate_values(cell):
     cell["color_current"] = (r_new, g_new, b_new)
 
 
-def update_visuals(grid):
-    for row in grid:
-        for cell in row:
-            interpolate_values(cell)
+def update_visuals(grid, tracker):
+    """Interpolate only the cells still converging; settled cells snap to their targets."""
+    converging = tracker["converging"]
+    for (x, y) in list(converging):
+        cell = grid[y][x]
+        interpolate_values(cell)
+        if is_cell_settled(cell):
+            cell["state_factor_current"] = cell["state_factor_target"]
+            cell["color_current"] = cell["color_target"]
+            converging.discard((x, y))
 
 
 def draw_grid(surface, grid):
@@ -333,13 +352,8 @@ def draw_grid(surface, grid):
                 pygame.draw.circle(surface, color, (cx, cy), size)
 
 
-def calculate_scores(grid):
-    scores = {"Blue": 0, "Green": 0}
-    for row in grid:
-        for cell in row:
-            if cell["alive"] and cell["team"]:
-                scores[cell["team"]] += 1
-    return scores
+def calculate_scores(tracker):
+    return dict(tracker["scores"])
 
 
 def render_text_with_border(screen, text, font, color, x, y):
@@ -352,25 +366,15 @@ def render_text_with_border(screen, text, font, color, x, y):
     screen.blit(text_surface, (x, y))
 
 
-def is_grid_stable(grid, color_epsilon=1.0, factor_epsilon=0.01):
+def is_grid_stable(tracker):
     """Check if all cells are done transitioning color and factor."""
-    for row in grid:
-        for c in row:
-            sc = c["state_factor_current"]
-            st = c["state_factor_target"]
-            if abs(sc - st) > factor_epsilon:
-                return False
-            cc, ct = c["color_current"], c["color_target"]
-            if (abs(cc[0] - ct[0]) > color_epsilon or
-                abs(cc[1] - ct[1]) > color_epsilon or
-                abs(cc[2] - ct[2]) > color_epsilon):
-                return False
-    return True
+    return not tracker["converging"]
 
 
 def main():
-    initialize_seed(SEED)
-    grid = create_grid(NUM_STARTING_PARTICLES)
+    chaos_rng = initialize_seed(SEED)
+    grid = create_grid(NUM_STARTING_PARTICLES, chaos_rng)
+    tracker = create_tracker(grid)
 
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Smooth Calm Particle Battle")
@@ -399,9 +403,9 @@ def main():
         # PHASE 1: Full chaos (GoL + toggles/drifts)
         elif time_elapsed < BATTLE_END:
             # Game of Life
-            grid = game_of_life_step(grid)
+            grid = game_of_life_step(grid, tracker)
             # Apply chaos with full rates
-            apply_chaos(grid, INITIAL_TOGGLE_RATE, INITIAL_DRIFT_CHANCE)
+            apply_chaos(grid, tracker, chaos_rng, INITIAL_TOGGLE_RATE, INITIAL_DRIFT_CHANCE)
 
         # PHASE 2: Ramping chaos down
         elif time_elapsed < CALM_END:
@@ -413,21 +417,21 @@ def main():
             drift_rate  = INITIAL_DRIFT_CHANCE * (1.0 - ramp_progress)
 
             # Standard GoL
-            grid = game_of_life_step(grid)
+            grid = game_of_life_step(grid, tracker)
             # But chaos gets weaker each frame
-            apply_chaos(grid, toggle_rate, drift_rate)
+            apply_chaos(grid, tracker, chaos_rng, toggle_rate, drift_rate)
 
         # PHASE 3: Freeze logic, let visuals finish
         else:
             if not stable_after_freeze:
                 # Check if everything's stable
-                if is_grid_stable(grid):
-                    final_scores = calculate_scores(grid)
+                if is_grid_stable(tracker):
+                    final_scores = calculate_scores(tracker)
                     stable_after_freeze = True
             # No births/deaths or toggles/drifts
 
         # Always do interpolation
-        update_visuals(grid)
+        update_visuals(grid, tracker)
 
         # Draw
         draw_grid(render_surface, grid)
@@ -441,7 +445,7 @@ def main():
             render_text_with_border(screen, f"Green: {final_scores['Green']}", font, TEAM_COLORS["Green"], 10, 40)
         else:
             # Show live scoreboard
-            current_scores = calculate_scores(grid)
+            current_scores = calculate_scores(tracker)
             render_text_with_border(screen, f"Blue: {current_scores['Blue']}", font, TEAM_COLORS["Blue"], 10, 10)
             render_text_with_border(screen, f"Green: {current_scores['Green']}", font, TEAM_COLORS["Green"], 10, 40)
 
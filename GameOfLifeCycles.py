@@ -0,0 +1,68 @@
+import hashlib
+from collections import deque
+
+# Cycle detection and replay for the dict-grid Game of Life scripts
+# (GameOfLife4Trippy, GameOfLife5)
+
+
+def logic_key(grid, team_codes):
+    """Hash of the logic state (alive + team per cell) of a generation."""
+    codes = bytes(team_codes[cell["team"]] if cell["alive"] else 0 for row in grid for cell in row)
+    return hashlib.blake2b(codes, digest_size=8).digest()
+
+def grid_changes(grid, new_grid):
+    """Cells whose logic or targets differ between two generations, with their new values."""
+    changes = []
+    for y, (old_row, new_row) in enumerate(zip(grid, new_grid)):
+        for x, (old, new) in enumerate(zip(old_row, new_row)):
+            if (old["alive"] != new["alive"] or old["team"] != new["team"]
+                    or old["color_target"] != new["color_target"]
+                    or old["state_factor_target"] != new["state_factor_target"]):
+                changes.append((x, y, new["alive"], new["team"],
+                                new["color_target"], new["state_factor_target"]))
+    return changes
+
+def create_cycle_tracker(step_fn, team_codes, history_length):
+    """
+    Tracker state for advance_generation(). step_fn(grid) computes the real next
+    generation; history_length generations of logic-state hashes are kept to
+    spot still lifes and oscillators.
+    """
+    return {"step_fn": step_fn, "team_codes": team_codes,
+            "history": deque(maxlen=history_length), "generation": 0, "period": None,
+            "recording": [], "replay": None, "replay_index": 0}
+
+def advance_generation(grid, cycle):
+    """
+    step_fn(grid), unless the board has settled into a cycle. Each generation's
+    logic state is hashed into a short history; once a hash repeats the period is
+    reported, one more period is computed while recording the per-cell changes,
+    and from then on the cycle is replayed from that cache.
+    """
+    cycle["generation"] += 1
+    if cycle["replay"] is not None:
+        for x, y, alive, team, color_target, state_factor_target in cycle["replay"][cycle["replay_index"]]:
+            cell = grid[y][x]
+            cell["alive"] = alive
+            cell["team"] = team
+            cell["color_target"] = color_target
+            cell["state_factor_target"] = state_factor_target
+        cycle["replay_index"] = (cycle["replay_index"] + 1) % cycle["period"]
+        return grid
+
+    new_grid = cycle["step_fn"](grid)
+
+    if cycle["period"] is not None:
+        cycle["recording"].append(grid_changes(grid, new_grid))
+        if len(cycle["recording"]) == cycle["period"]:
+            cycle["replay"] = cycle["recording"]
+        return new_grid
+
+    key = logic_key(new_grid, cycle["team_codes"])
+    history = cycle["history"]
+    if key in history:
+        last_seen = len(history) - 1 - list(reversed(history)).index(key)
+        cycle["period"] = len(history) - last_seen
+        print(f"Cycle detected: period {cycle['period']} at generation {cycle['generation']}")
+    history.append(key)
+    return new_grid
@@ -1,5 +1,6 @@
 import pygame
 import random
+import numpy as np
 
 # Screen and rendering settings
 SCREEN_WIDTH = 432
@@ -16,11 +17,13 @@ DECAY_PROBABILITY = 0.5
 COLOR_CHANGE_RATE = 0.05
 EXPLOSION_THRESHOLD = 1000  # Minimum size for a cluster to trigger a shockwave
 EXPLOSION_RADIUS = 1  # Radius (in cells) of the shockwave effect
+EXPLOSION_DAMAGE = 5  # State lost by every live cell caught in a shockwave
 
 # Seed for reproducibility
 SEED = 42
 
 # Team settings
+TEAMS = ["Red", "Blue"]
 TEAM_COLORS = {"Red": (255, 0, 0), "Blue": (0, 0, 255)}
 MIXED_COLOR = (180, 0, 180)
 BACKGROUND_COLOR = (10, 10, 30)
@@ -44,140 +47,197 @@ GRID_HEIGHT = RENDER_HEIGHT // GRID_SIZE
 
 
 def initialize_seed(seed):
-    """Set random seed."""
+    """Set random seed and return the batch generator used for decay draws."""
     random.seed(seed)
+    return np.random.default_rng(seed)
+
+
+def allocate_grid():
+    """Allocate one state buffer: state level, team index and exploded flag per cell."""
+    return {"state": np.zeros((GRID_HEIGHT, GRID_WIDTH), dtype=np.int16),
+            "team": np.zeros((GRID_HEIGHT, GRID_WIDTH), dtype=np.int8),
+            "exploded": np.zeros((GRID_HEIGHT, GRID_WIDTH), dtype=bool)}
 
 
 def create_grid():
     """Initialize the grid with random team cells."""
-    grid = [[{"state": random.randint(0, CELL_MAX_STATE) if random.random() < INITIAL_LIVE_CHANCE else 0,
-              "team": random.choice(["Red", "Blue"]),
-              "exploded": False} for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
+    grid = allocate_grid()
+    for y in range(GRID_HEIGHT):
+        for x in range(GRID_WIDTH):
+            grid["state"][y, x] = random.randint(0, CELL_MAX_STATE) if random.random() < INITIAL_LIVE_CHANCE else 0
+            grid["team"][y, x] = TEAMS.index(random.choice(TEAMS))
     return grid
 
 
-def count_team_neighbors(grid, x, y):
-    """Count the number of neighbors for each team."""
-    team_counts = {"Red": 0, "Blue": 0}
+def neighbor_sum(mask):
+    """Count the set neighbors of every cell in a boolean mask."""
+    padded = np.pad(mask, 1).astype(np.int8)
+    total = np.zeros(mask.shape, dtype=np.int8)
     for dx, dy in NEIGHBOR_OFFSETS:
-        nx, ny = x + dx, y + dy
-        if 0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT and grid[ny][nx]["state"] > 0:
-            team_counts[grid[ny][nx]["team"]] += 1
-    return team_counts
+        total += padded[1 + dy:1 + dy + GRID_HEIGHT, 1 + dx:1 + dx + GRID_WIDTH]
+    return total
+
+
+def count_team_neighbors(grid):
+    """Count the number of Red and Blue neighbors of every cell."""
+    alive = grid["state"] > 0
+    blue = alive & (grid["team"] == 1)
+    return neighbor_sum(alive & ~blue), neighbor_sum(blue)
+
+
+def label_clusters(alive, team):
+    """
+    Label 8-connected clusters of same-team live cells without recursion.
+    Union-find over the flattened array: every pass hooks the larger root of each
+    linked pair under the smaller one, then pointer-jumps until every cell points
+    straight at its root. Returns a label array (0 = empty, 1..n = cluster id),
+    the cluster sizes and the team of each cluster (index 0 is unused).
+    """
+    height, width = alive.shape
+    index = np.arange(height * width).reshape(height, width)
+    parent = np.arange(height * width)
+
+    # Only the forward half of the neighborhood is needed to link every pair once
+    links_a, links_b = [], []
+    for dy, dx in ((0, 1), (1, -1), (1, 0), (1, 1)):
+        src_y, dst_y = slice(0, height - dy), slice(dy, height)
+        src_x = slice(max(0, -dx), width - max(0, dx))
+        dst_x = slice(max(0, dx), width - max(0, -dx))
+        same = (alive[src_y, src_x] & alive[dst_y, dst_x]
+                & (team[src_y, src_x] == team[dst_y, dst_x]))
+        links_a.append(index[src_y, src_x][same])
+        links_b.append(index[dst_y, dst_x][same])
+    a = np.concatenate(links_a)
+    b = np.concatenate(links_b)
+
+    while True:
+        root_a, root_b = parent[a], parent[b]
+        differ = root_a != root_b
+        if not differ.any():
+            break
+        low = np.minimum(root_a[differ], root_b[differ])
+        high = np.maximum(root_a[differ], root_b[differ])
+        np.minimum.at(parent, high, low)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+    labels = np.zeros((height, width), dtype=np.int32)
+    roots, inverse, counts = np.unique(parent[index[alive]], return_inverse=True, return_counts=True)
+    labels[alive] = inverse + 1
+    sizes = np.concatenate(([0], counts))
+    cluster_team = np.concatenate(([-1], team.ravel()[roots]))
+    return labels, sizes, cluster_team
 
 
 def detect_clusters(grid):
-    """Detect large clusters of cells for each team."""
-    clusters = {"Red": [], "Blue": []}
-    visited = [[False for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-
-    def dfs(x, y, team, cluster):
-        if visited[y][x] or grid[y][x]["team"] != team or grid[y][x]["state"] == 0:
-            return
-        visited[y][x] = True
-        cluster.append((x, y))
-        for dx, dy in NEIGHBOR_OFFSETS:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT:
-                dfs(nx, ny, team, cluster)
-
-    for y in range(GRID_HEIGHT):
-        for x in range(GRID_WIDTH):
-            if grid[y][x]["state"] > 0 and not visited[y][x]:
-                team = grid[y][x]["team"]
-                cluster = []
-                dfs(x, y, team, cluster)
-                if cluster:
-                    clusters[team].append(cluster)
-
-    return clusters
-
-
-def trigger_shockwaves(grid, clusters):
-    """Trigger shockwaves for large clusters."""
-    for team, team_clusters in clusters.items():
-        for cluster in team_clusters:
-            if len(cluster) >= EXPLOSION_THRESHOLD:
-                # Trigger shockwave
-                for cx, cy in cluster:
-                    grid[cy][cx]["exploded"] = True  # Mark cell as exploded
-                    for dx, dy in NEIGHBOR_OFFSETS:
-                        nx, ny = cx + dx, cy + dy
-                        if 0 <= nx < GRID_WIDTH and 0 <= ny < GRID_HEIGHT and grid[ny][nx]["state"] > 0:
-                            # Decay cells in the explosion radius
-                            grid[ny][nx]["state"] = max(0, grid[ny][nx]["state"] - 5)
+    """
+    Detect clusters of cells for each team.
+    Returns the label array and, per team, the cluster ids with their sizes.
+    """
+    labels, sizes, cluster_team = label_clusters(grid["state"] > 0, grid["team"])
+    ids = np.arange(len(sizes))
+    clusters = {}
+    for team_index, team_name in enumerate(TEAMS):
+        mine = cluster_team == team_index
+        clusters[team_name] = (ids[mine], sizes[mine])
+    return labels, clusters
+
+
+def dilate(mask, radius):
+    """Grow a boolean mask by radius cells in every direction (square neighborhood)."""
+    rows = mask.copy()
+    for shift in range(1, radius + 1):
+        rows[shift:, :] |= mask[:-shift, :]
+        rows[:-shift, :] |= mask[shift:, :]
+    grown = rows.copy()
+    for shift in range(1, radius + 1):
+        grown[:, shift:] |= rows[:, :-shift]
+        grown[:, :-shift] |= rows[:, shift:]
+    return grown
+
+
+def trigger_shockwaves(grid, labels, clusters):
+    """
+    Trigger shockwaves for large clusters: the exploding cells are dilated by
+    EXPLOSION_RADIUS and every live cell under the blast loses EXPLOSION_DAMAGE once.
+    """
+    exploding = [ids[sizes >= EXPLOSION_THRESHOLD] for ids, sizes in clusters.values()]
+    exploding = np.concatenate(exploding)
+    if len(exploding) == 0:
+        return
+    exploded = np.isin(labels, exploding)
+    grid["exploded"] |= exploded  # Mark cells as exploded
+    blast = dilate(exploded, EXPLOSION_RADIUS) & (labels > 0)
+    state = grid["state"]
+    np.subtract(state, EXPLOSION_DAMAGE, out=state, where=blast)
+    np.maximum(state, 0, out=state)
 
 def draw_grid(surface, grid):
     """Draw the grid."""
-    for y in range(GRID_HEIGHT):
-        for x in range(GRID_WIDTH):
-            cell = grid[y][x]
-            if cell["state"] > 0:
-                color = get_color(cell)
-                size = int(GRID_SIZE * (0.5 + 0.5 * (cell["state"] / CELL_MAX_STATE)))
-                cx = x * GRID_SIZE + GRID_SIZE // 2
-                cy = y * GRID_SIZE + GRID_SIZE // 2
-                pygame.draw.circle(surface, color, (cx, cy), size)
+    for y, x in np.argwhere(grid["state"] > 0):
+        state = grid["state"][y, x]
+        color = get_color(state, TEAMS[grid["team"][y, x]])
+        size = int(GRID_SIZE * (0.5 + 0.5 * (state / CELL_MAX_STATE)))
+        cx = x * GRID_SIZE + GRID_SIZE // 2
+        cy = y * GRID_SIZE + GRID_SIZE // 2
+        pygame.draw.circle(surface, color, (cx, cy), size)
 
 
-def get_color(cell):
+def get_color(state, team):
     """Get the color of a cell based on team and state."""
-    if cell["state"] == 0:
+    if state == 0:
         return BACKGROUND_COLOR
-    base_color = TEAM_COLORS.get(cell["team"], MIXED_COLOR)
-    fade_factor = cell["state"] / CELL_MAX_STATE
+    base_color = TEAM_COLORS.get(team, MIXED_COLOR)
+    fade_factor = state / CELL_MAX_STATE
     return tuple(int(c * fade_factor) for c in base_color)
 
 
-
-def update_grid(grid):
-    """Evolve the grid based on team influence and shockwaves."""
-    new_grid = [[{"state": 0, "team": None, "exploded": False} for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-
+def update_grid(grid, new_grid, rng):
+    """
+    Evolve the grid based on team influence and shockwaves.
+    The next generation is written into the preallocated new_grid buffer, which
+    is returned so the caller can swap the two buffers.
+    """
     # Detect clusters and trigger shockwaves
-    clusters = detect_clusters(grid)
-    trigger_shockwaves(grid, clusters)
-
-    for y in range(GRID_HEIGHT):
-        for x in range(GRID_WIDTH):
-            cell = grid[y][x]
-            team_counts = count_team_neighbors(grid, x, y)
-            total_neighbors = team_counts["Red"] + team_counts["Blue"]
-
-            # Decide the dominant team based on majority
-            dominant_team = None
-            if team_counts["Red"] > team_counts["Blue"]:
-                dominant_team = "Red"
-            elif team_counts["Blue"] > team_counts["Red"]:
-                dominant_team = "Blue"
-
-            # Cell behavior
-            if cell["state"] > 0:  # Active cell
-                if not cell["exploded"]:  # Only update non-exploded cells
-                    if STABILITY_RANGE[0] <= total_neighbors <= STABILITY_RANGE[1]:
-                        new_grid[y][x] = {"state": min(cell["state"] + 1, CELL_MAX_STATE),
-                                          "team": cell["team"],
-                                          "exploded": False}
-                    else:
-                        new_grid[y][x] = {"state": max(cell["state"] - 1, 0),
-                                          "team": cell["team"],
-                                          "exploded": False}
-                else:
-                    new_grid[y][x] = {"state": max(0, cell["state"] - 5), "team": cell["team"], "exploded": False}
-            elif total_neighbors == BIRTH_THRESHOLD and dominant_team:  # Birth
-                new_grid[y][x] = {"state": 1, "team": dominant_team, "exploded": False}
-
-            # Decay
-            if random.random() < DECAY_PROBABILITY and new_grid[y][x]["state"] > 0:
-                new_grid[y][x]["state"] -= 1
+    labels, clusters = detect_clusters(grid)
+    trigger_shockwaves(grid, labels, clusters)
+
+    red_neighbors, blue_neighbors = count_team_neighbors(grid)
+    total_neighbors = red_neighbors + blue_neighbors
+    state, team, exploded = grid["state"], grid["team"], grid["exploded"]
+    new_state, new_team = new_grid["state"], new_grid["team"]
+
+    # Active cells grow inside the stability range and fade outside it,
+    # exploded cells take the shockwave damage instead
+    alive = state > 0
+    stable = (total_neighbors >= STABILITY_RANGE[0]) & (total_neighbors <= STABILITY_RANGE[1])
+    new_state[:] = 0
+    np.copyto(new_state, np.where(stable, np.minimum(state + 1, CELL_MAX_STATE), state - 1),
+              where=alive & ~exploded)
+    np.copyto(new_state, np.maximum(state - EXPLOSION_DAMAGE, 0), where=alive & exploded)
+    new_team[:] = team
+
+    # Birth, for the dominant team based on majority
+    births = ~alive & (total_neighbors == BIRTH_THRESHOLD) & (red_neighbors != blue_neighbors)
+    new_state[births] = 1
+    new_team[births] = blue_neighbors[births] > red_neighbors[births]
+    new_grid["exploded"][:] = False
+
+    # Decay, one batch draw for the whole board
+    decay = rng.random(new_state.shape) < DECAY_PROBABILITY
+    new_state -= decay & (new_state > 0)
 
     return new_grid
 
 
 def main():
     """Main simulation."""
-    initialize_seed(SEED)
+    rng = initialize_seed(SEED)
     grid = create_grid()
+    spare_grid = allocate_grid()
     clock = pygame.time.Clock()
 
     running = True
@@ -186,7 +246,7 @@ def main():
             if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
                 running = False
 
-        grid = update_grid(grid)
+        grid, spare_grid = update_grid(grid, spare_grid, rng), grid
 
         # Draw grid
         render_surface.fill(BACKGROUND_COLOR)
@@ -0,0 +1,199 @@
+import os
+import zlib
+import pygame
+import numpy as np
+
+from GameOfLifePacked import (
+    PackedBoard, random_board, board_surface, render_text_with_border,
+    SCREEN_WIDTH, SCREEN_HEIGHT, GRID_WIDTH, GRID_HEIGHT, FPS, INITIAL_LIVE_CHANCE,
+    TEAM_COLORS, INITIAL_TOGGLE_RATE, SEED, SCORE_FONT_SIZE,
+    START_DELAY_SECONDS, BATTLE_END, CALM_DOWN_DURATION, CALM_END
+)
+
+# ----------------------------
+# Settings
+# ----------------------------
+KEYFRAME_INTERVAL = 60  # Generations between full copies of the logic state
+COMPRESS_LEVEL = 1      # zlib level for keyframes and deltas; higher saves ~25% at 5x the time
+SCRUB_STEP = 10         # Generations jumped per LEFT/RIGHT press while paused
+
+TIMELAPSE_EVERY = 5     # Keep every Kth generation in the time-lapse
+TIMELAPSE_FOLDER = "timelapse"
+
+PLANES = ("alive", "team", "converting")
+
+
+class BoardHistory:
+    """
+    Compact record of a packed GoL run: a copy of the logic planes every
+    keyframe_interval generations, and in between the XOR of each plane with
+    the previous generation, all zlib-compressed. Team and converting bits
+    are only ever set on live cells, so their XOR is masked with the new
+    alive plane (the masked-off bits are restored by masking on replay),
+    which leaves them mostly zeros.
+    """
+
+    def __init__(self, board, keyframe_interval=KEYFRAME_INTERVAL):
+        self.width = board.width
+        self.height = board.height
+        self.shape = board.alive.shape
+        self.keyframe_interval = keyframe_interval
+        self.keyframes = {}  # generation -> compressed planes
+        self.deltas = {}     # generation -> compressed XOR planes
+        self.first = board.generation
+        self.latest = board.generation
+        self.previous = self.planes_of(board)
+        self.keyframes[board.generation] = self.compress(self.previous)
+
+    @staticmethod
+    def planes_of(board):
+        return {plane: getattr(board, plane).copy() for plane in PLANES}
+
+    @staticmethod
+    def compress(planes):
+        return {plane: zlib.compress(planes[plane].tobytes(), COMPRESS_LEVEL) for plane in PLANES}
+
+    def decompress(self, data):
+        return np.frombuffer(zlib.decompress(data), dtype=np.uint64).reshape(self.shape)
+
+    def record(self, board):
+        """Store the next generation; call once after every step."""
+        if board.generation != self.latest + 1:
+            raise ValueError(f"expected generation {self.latest + 1}, got {board.generation}")
+        planes = self.planes_of(board)
+        if board.generation % self.keyframe_interval == 0:
+            self.keyframes[board.generation] = self.compress(planes)
+        else:
+            change = {}
+            for plane in PLANES:
+                change[plane] = planes[plane] ^ self.previous[plane]
+                if plane != "alive":
+                    change[plane] &= planes["alive"]
+            self.deltas[board.generation] = self.compress(change)
+        self.previous = planes
+        self.latest = board.generation
+
+    def stored_bytes(self, generation):
+        """Bytes kept for one recorded generation (keyframe or delta)."""
+        record = self.keyframes.get(generation) or self.deltas[generation]
+        return sum(len(data) for data in record.values())
+
+    def board_at(self, generation):
+        """Rebuild any recorded generation by replaying deltas from the nearest keyframe before it."""
+        if not self.first <= generation <= self.latest:
+            raise ValueError(f"generation {generation} not recorded ({self.first}-{self.latest})")
+        start = max(key for key in self.keyframes if key <= generation)
+        board = PackedBoard(self.width, self.height)
+        for plane, data in self.keyframes[start].items():
+            setattr(board, plane, self.decompress(data).copy())
+        board.generation = start
+        for _ in range(start, generation):
+            self.advance(board)
+        return board
+
+    def advance(self, board):
+        """Move a rebuilt board forward one recorded generation in place."""
+        generation = board.generation + 1
+        if generation in self.keyframes:
+            for plane, data in self.keyframes[generation].items():
+                setattr(board, plane, self.decompress(data).copy())
+        else:
+            # PLANES has alive first, so team and converting are masked with the new alive
+            for plane in PLANES:
+                words = getattr(board, plane)
+                words ^= self.decompress(self.deltas[generation][plane])
+                if plane != "alive":
+                    words &= board.alive
+        board.generation = generation
+
+    def frames(self, every, start=None, end=None):
+        """Yield every Kth recorded generation, replaying forward once without re-simulating."""
+        start = self.first if start is None else start
+        end = self.latest if end is None else end
+        board = self.board_at(start)
+        while True:
+            yield board
+            if board.generation + every > end:
+                return
+            for _ in range(every):
+                self.advance(board)
+
+    def export_timelapse(self, folder=TIMELAPSE_FOLDER, every=TIMELAPSE_EVERY, size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        """Save every Kth generation as a numbered PNG, one pixel per cell scaled to size."""
+        os.makedirs(folder, exist_ok=True)
+        paths = []
+        for i, board in enumerate(self.frames(every)):
+            full_size = pygame.Surface((board.width, board.height), depth=24)
+            full_size.blit(board_surface(board), (0, 0))
+            surface = pygame.transform.smoothscale(full_size, size)
+            path = os.path.join(folder, f"frame_{i:05d}.png")
+            pygame.image.save(surface, path)
+            paths.append(path)
+        return paths
+
+
+def main():
+    pygame.init()
+    pygame.font.init()
+    font = pygame.font.SysFont("Arial", SCORE_FONT_SIZE)
+
+    rng = np.random.default_rng(SEED)
+    board = random_board(GRID_WIDTH, GRID_HEIGHT, INITIAL_LIVE_CHANCE, rng)
+    history = BoardHistory(board)
+
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Packed Particle Battle (SPACE pause, LEFT/RIGHT rewind, T time-lapse)")
+    clock = pygame.time.Clock()
+
+    running = True
+    paused = False
+    frame_count = 0
+    shown = board  # Board on screen: the live one, or a rebuilt one while scrubbing
+
+    while running:
+        clock.tick(FPS)
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (
+               event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    paused = not paused
+                    shown = board
+                elif event.key in (pygame.K_LEFT, pygame.K_RIGHT) and paused:
+                    step = -SCRUB_STEP if event.key == pygame.K_LEFT else SCRUB_STEP
+                    target = min(max(shown.generation + step, history.first), history.latest)
+                    shown = history.board_at(target)
+                elif event.key == pygame.K_t:
+                    paths = history.export_timelapse()
+                    print(f"Saved {len(paths)} time-lapse frames to {TIMELAPSE_FOLDER}/")
+
+        if not paused:
+            # Same phases as GameOfLife6FAIL: delay, battle, chaos ramp-down, freeze
+            time_elapsed = frame_count / FPS
+            if START_DELAY_SECONDS <= time_elapsed < BATTLE_END:
+                board.step(SEED, INITIAL_TOGGLE_RATE)
+                history.record(board)
+            elif BATTLE_END <= time_elapsed < CALM_END:
+                ramp_progress = min(1.0, (time_elapsed - BATTLE_END) / CALM_DOWN_DURATION)
+                board.step(SEED, INITIAL_TOGGLE_RATE * (1.0 - ramp_progress))
+                history.record(board)
+            frame_count += 1
+
+        render_surface = board_surface(shown).convert()
+        scaled_surface = pygame.transform.smoothscale(render_surface, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        screen.blit(scaled_surface, (0, 0))
+
+        scores = shown.population()
+        render_text_with_border(screen, f"Blue: {scores['Blue']}", font, TEAM_COLORS["Blue"], 10, 10)
+        render_text_with_border(screen, f"Green: {scores['Green']}", font, TEAM_COLORS["Green"], 10, 40)
+        render_text_with_border(screen, f"Gen {shown.generation}", font, (255, 255, 255), 10, 70)
+
+        pygame.display.flip()
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,563 @@
+import math
+import pygame
+import numpy as np
+
+# ----------------------------
+# Settings
+# ----------------------------
+SCREEN_WIDTH = 432
+SCREEN_HEIGHT = 768
+RENDER_WIDTH = 2160
+RENDER_HEIGHT = 3840
+
+GRID_SIZE = 1  # One pixel per cell: a 4K-class board for zoom-out shots
+GRID_WIDTH = RENDER_WIDTH // GRID_SIZE
+GRID_HEIGHT = RENDER_HEIGHT // GRID_SIZE
+
+FPS = 60
+
+# Game of Life rules:
+BIRTH_RULE = [3]           # Birth with 3 neighbors
+SURVIVAL_RULE = [2, 3, 4]  # Survive with 2-4 neighbors
+
+INITIAL_LIVE_CHANCE = 0.2
+NUM_STARTING_PARTICLES = 400000  # total, placed in small clusters like GameOfLife6FAIL
+CLUSTER_SIZE_RANGE = (2, 4)
+CLUSTER_GROW_ATTEMPTS = 8  # Random neighbor picks per growth round before a cluster gives up
+
+CONVERSION_THRESHOLD = 4  # Aggressiveness for color conversions
+
+TEAM_COLORS = {
+    "Blue": (0, 100, 255),
+    "Green": (0, 200, 0)
+}
+BACKGROUND_COLOR = (10, 10, 30)
+
+# The float layer is optional: without it cells are drawn straight from the logic bits.
+# At 4K board sizes the float layer costs far more per frame than stepping the logic.
+SMOOTH_VISUALS = False
+FADE_SPEED = 0.25
+COLOR_BLEND_SPEED = 0.37
+
+# Chaos: border cells flip team at this rate during the battle
+INITIAL_TOGGLE_RATE = 0.009
+
+SEED = 69
+SCORE_FONT_SIZE = 24
+
+# ----------------------------
+# Timing Flow
+# ----------------------------
+START_DELAY_SECONDS = 2
+BATTLE_PHASE_SECONDS = 8
+CALM_DOWN_DURATION = 4
+
+BATTLE_END = START_DELAY_SECONDS + BATTLE_PHASE_SECONDS
+CALM_END = BATTLE_END + CALM_DOWN_DURATION
+
+BLOCK_ROWS = 64  # Rows sharing one random stream; any split into whole blocks steps identically
+
+WORD_BITS = 64
+ONE = np.uint64(1)
+HIGH_BIT_SHIFT = np.uint64(WORD_BITS - 1)
+POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+# ----------------------------
+# Bitwise helpers
+# ----------------------------
+def shift_west(words):
+    """Each cell takes the value of its western neighbor (x - 1)."""
+    out = words << ONE
+    out[:, 1:] |= words[:, :-1] >> HIGH_BIT_SHIFT
+    return out
+
+
+def shift_east(words):
+    """Each cell takes the value of its eastern neighbor (x + 1)."""
+    out = words >> ONE
+    out[:, :-1] |= words[:, 1:] << HIGH_BIT_SHIFT
+    return out
+
+
+def shift_north(words):
+    """Each cell takes the value of its northern neighbor (y - 1)."""
+    out = np.zeros_like(words)
+    out[1:] = words[:-1]
+    return out
+
+
+def shift_south(words):
+    """Each cell takes the value of its southern neighbor (y + 1)."""
+    out = np.zeros_like(words)
+    out[:-1] = words[1:]
+    return out
+
+
+def neighbor_planes(words):
+    """The eight neighbor planes of a packed bit plane."""
+    north = shift_north(words)
+    south = shift_south(words)
+    return [north, south,
+            shift_west(words), shift_east(words),
+            shift_west(north), shift_east(north),
+            shift_west(south), shift_east(south)]
+
+
+def full_add(a, b, c):
+    """Bit-sliced full adder: sum and carry planes of three input planes."""
+    partial = a ^ b
+    return partial ^ c, (a & b) | (c & partial)
+
+
+def count_planes(planes):
+    """
+    Add eight 1-bit planes with a carry-save adder tree.
+    Returns the count (0-8) as four bit planes, least significant first.
+    """
+    s0, c0 = full_add(planes[0], planes[1], planes[2])
+    s1, c1 = full_add(planes[3], planes[4], planes[5])
+    s2, c2 = planes[6] ^ planes[7], planes[6] & planes[7]
+    ones, c3 = full_add(s0, s1, s2)
+    t0, d0 = full_add(c0, c1, c2)
+    twos, d1 = t0 ^ c3, t0 & c3
+    return [ones, twos, d0 ^ d1, d0 & d1]
+
+
+def count_equals(bits, n):
+    """Plane of the cells whose bit-sliced count equals n."""
+    mask = ~np.zeros_like(bits[0])
+    for i, bit in enumerate(bits):
+        mask &= bit if (n >> i) & 1 else ~bit
+    return mask
+
+
+def count_in(bits, values):
+    """Plane of the cells whose bit-sliced count is one of values."""
+    mask = np.zeros_like(bits[0])
+    for n in values:
+        mask |= count_equals(bits, n)
+    return mask
+
+
+def count_at_least(bits, n):
+    """Plane of the cells whose bit-sliced count is at least n."""
+    return count_in(bits, range(n, 9))
+
+
+def count_greater(a_bits, b_bits):
+    """Bit-sliced comparator: plane of the cells where a > b."""
+    greater = np.zeros_like(a_bits[0])
+    equal = ~greater
+    for a, b in zip(reversed(a_bits), reversed(b_bits)):
+        greater |= equal & a & ~b
+        equal &= ~(a ^ b)
+    return greater
+
+
+def popcount(words):
+    """Number of set bits in a packed array."""
+    return int(POPCOUNT_TABLE[words.view(np.uint8)].sum(dtype=np.int64))
+
+
+# ----------------------------
+# Row-range stepping
+# ----------------------------
+def make_row_mask(width):
+    """Per-word mask clearing the bits past the right edge in the last word of each row."""
+    words = (width + WORD_BITS - 1) // WORD_BITS
+    mask = np.full(words, ~np.uint64(0), dtype=np.uint64)
+    spare_bits = words * WORD_BITS - width
+    if spare_bits:
+        mask[-1] = ~np.uint64(0) >> np.uint64(spare_bits)
+    return mask
+
+
+def row_blocks(height):
+    """(start, end) rows of each random-stream block."""
+    return [(r0, min(r0 + BLOCK_ROWS, height)) for r0 in range(0, height, BLOCK_ROWS)]
+
+
+def block_rng(seed, generation, block):
+    """Random stream of one block of rows in one generation."""
+    return np.random.default_rng([seed, generation, block])
+
+
+def overwhelmed(own_count, opp_count):
+    """Cells whose opposite-team neighbors reach CONVERSION_THRESHOLD times their own."""
+    mask = np.zeros_like(own_count[0])
+    for own in range(9):
+        needed = max(math.ceil(own * CONVERSION_THRESHOLD), 1)
+        if needed > 8:
+            break
+        mask |= count_equals(own_count, own) & count_at_least(opp_count, needed)
+    return mask
+
+
+def life_rows(alive, team, row_mask, r0, r1, rng):
+    """
+    Next generation of rows r0:r1, reading one halo row on each side.
+    GoL birth/survival; births join the majority team of their neighbors
+    (ties drawn from rng); live cells overwhelmed by the other team are
+    marked converting, which only blends their color as in GameOfLife6FAIL.
+    Returns the new alive, team and converting rows.
+    """
+    lo, hi = max(r0 - 1, 0), min(r1 + 1, alive.shape[0])
+    own_rows = slice(r0 - lo, r1 - lo)
+    blue = alive[lo:hi] & ~team[lo:hi]
+    alive_count = count_planes(neighbor_planes(alive[lo:hi]))
+    green_count = count_planes(neighbor_planes(team[lo:hi]))
+    blue_count = count_planes(neighbor_planes(blue))
+    alive_count = [bit[own_rows] for bit in alive_count]
+    green_count = [bit[own_rows] for bit in green_count]
+    blue_count = [bit[own_rows] for bit in blue_count]
+    was_alive, was_green = alive[r0:r1], team[r0:r1]
+
+    survive = was_alive & count_in(alive_count, SURVIVAL_RULE)
+    born = ~was_alive & count_in(alive_count, BIRTH_RULE) & row_mask
+    green_wins = count_greater(green_count, blue_count)
+    blue_wins = count_greater(blue_count, green_count)
+    tie = born & ~green_wins & ~blue_wins
+    new_alive = survive | born
+    new_team = (survive & was_green) | (born & green_wins)
+    if tie.any():
+        new_team |= tie & rng.integers(0, np.iinfo(np.uint64).max, size=tie.shape,
+                                       dtype=np.uint64, endpoint=True)
+
+    converting = new_alive & ((new_team & overwhelmed(green_count, blue_count))
+                              | (~new_team & overwhelmed(blue_count, green_count)))
+    return new_alive, new_team, converting
+
+
+def border_rows(alive, team, r0, r1):
+    """Live cells of rows r0:r1 with at least one live neighbor of the opposite team."""
+    lo, hi = max(r0 - 1, 0), min(r1 + 1, alive.shape[0])
+    own_rows = slice(r0 - lo, r1 - lo)
+    green = team[lo:hi]
+    blue = alive[lo:hi] & ~green
+    near_green = np.zeros_like(green)
+    near_blue = np.zeros_like(green)
+    for plane in neighbor_planes(green):
+        near_green |= plane
+    for plane in neighbor_planes(blue):
+        near_blue |= plane
+    return ((green & near_blue) | (blue & near_green))[own_rows]
+
+
+def chaos_rows(alive, team, width, r0, r1, rng, toggle_rate):
+    """
+    Team flips of rows r0:r1: each border cell flips with probability toggle_rate.
+    Rather than one Bernoulli trial per cell, the number of hits in the rows
+    is drawn once and only those positions are checked.
+    """
+    flips = np.zeros((r1 - r0, alive.shape[1]), dtype=np.uint64)
+    cells = (r1 - r0) * width
+    hits = rng.binomial(cells, toggle_rate)
+    if hits == 0:
+        return flips
+    positions = rng.choice(cells, size=hits, replace=False)
+    ys, xs = np.divmod(positions, width)
+    words = xs // WORD_BITS
+    bits = ONE << (xs % WORD_BITS).astype(np.uint64)
+    on_border = (border_rows(alive, team, r0, r1)[ys, words] & bits) != 0
+    np.bitwise_or.at(flips, (ys[on_border], words[on_border]), bits[on_border])
+    return flips
+
+
+# ----------------------------
+# Packed board
+# ----------------------------
+class PackedBoard:
+    """
+    Logic state of a GoL battle, bit-packed: one alive bit and one team bit
+    (set = Green) per cell, 64 cells to a uint64 word along each row, plus
+    the converting bit of cells overwhelmed by the other team.
+    Team and converting bits are only ever set on live cells.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.words = (width + WORD_BITS - 1) // WORD_BITS
+        self.alive = np.zeros((height, self.words), dtype=np.uint64)
+        self.team = np.zeros((height, self.words), dtype=np.uint64)
+        self.converting = np.zeros((height, self.words), dtype=np.uint64)
+        self.row_mask = make_row_mask(width)
+        self.generation = 0
+
+    @classmethod
+    def from_cells(cls, alive, green):
+        """Pack boolean (height, width) alive and green arrays."""
+        height, width = alive.shape
+        board = cls(width, height)
+        board.alive = board.pack(alive)
+        board.team = board.pack(alive & green)
+        return board
+
+    def pack(self, cells):
+        padded = np.zeros((self.height, self.words * WORD_BITS), dtype=bool)
+        padded[:, :self.width] = cells
+        packed = np.packbits(padded, axis=1, bitorder="little")
+        return packed.view("<u8").astype(np.uint64)
+
+    def unpack(self, words):
+        as_bytes = words.astype("<u8").view(np.uint8)
+        return np.unpackbits(as_bytes, axis=1, bitorder="little")[:, :self.width].astype(bool)
+
+    def cells(self):
+        """Unpack to boolean (height, width) alive and green arrays."""
+        return self.unpack(self.alive), self.unpack(self.team)
+
+    def copy(self):
+        board = PackedBoard(self.width, self.height)
+        board.alive = self.alive.copy()
+        board.team = self.team.copy()
+        board.converting = self.converting.copy()
+        board.generation = self.generation
+        return board
+
+    def population(self):
+        """Live cells per team."""
+        green = popcount(self.team)
+        return {"Blue": popcount(self.alive) - green, "Green": green}
+
+    def step(self, seed, toggle_rate=0.0):
+        """
+        Advance one generation, block by block, then apply border chaos at
+        toggle_rate. Each block draws from block_rng(seed, generation, block),
+        so the result does not depend on how the rows are split up.
+        """
+        alive = np.empty_like(self.alive)
+        team = np.empty_like(self.team)
+        converting = np.empty_like(self.converting)
+        blocks = row_blocks(self.height)
+        rngs = [block_rng(seed, self.generation, block) for block in range(len(blocks))]
+        for (r0, r1), rng in zip(blocks, rngs):
+            alive[r0:r1], team[r0:r1], converting[r0:r1] = life_rows(
+                self.alive, self.team, self.row_mask, r0, r1, rng)
+        if toggle_rate > 0:
+            # Every block's border is read from the unflipped board before any flip lands
+            flips = [chaos_rows(alive, team, self.width, r0, r1, rng, toggle_rate)
+                     for (r0, r1), rng in zip(blocks, rngs)]
+            for (r0, r1), block_flips in zip(blocks, flips):
+                team[r0:r1] ^= block_flips
+                converting[r0:r1] &= ~block_flips
+        self.alive, self.team, self.converting = alive, team, converting
+        self.generation += 1
+
+
+def random_board(width, height, live_chance, rng):
+    """Board with each cell alive at live_chance, on a random team."""
+    alive = rng.random((height, width)) < live_chance
+    green = rng.random((height, width)) < 0.5
+    return PackedBoard.from_cells(alive, green)
+
+
+NEIGHBOR_DY = np.array([-1, -1, -1, 0, 0, 1, 1, 1])
+NEIGHBOR_DX = np.array([-1, 0, 1, -1, 1, -1, 0, 1])
+
+
+def grow_clusters(width, height, occupied, members, counts, sizes, rng):
+    """
+    Grow every cluster toward its size, one cell per round, all clusters at
+    once: each picks a random member and a random neighbor of it, and keeps
+    it if it is on the board, free in the occupancy bitmap and not claimed by
+    another cluster in the same round.
+    """
+    for _ in range(sizes.max() - 1):
+        for _ in range(CLUSTER_GROW_ATTEMPTS):
+            growing = np.flatnonzero(counts < sizes)
+            if len(growing) == 0:
+                break
+            picks = (rng.random(len(growing)) * counts[growing]).astype(np.int64)
+            ys, xs = np.divmod(members[growing, picks], width)
+            direction = rng.integers(0, 8, size=len(growing))
+            ys = ys + NEIGHBOR_DY[direction]
+            xs = xs + NEIGHBOR_DX[direction]
+            on_board = (ys >= 0) & (ys < height) & (xs >= 0) & (xs < width)
+            growing, targets = growing[on_board], (ys * width + xs)[on_board]
+            free = ~occupied[targets]
+            growing, targets = growing[free], targets[free]
+            targets, first = np.unique(targets, return_index=True)
+            growing = growing[first]
+            occupied[targets] = True
+            members[growing, counts[growing]] = targets
+            counts[growing] += 1
+
+
+def place_clusters(width, height, team_counts, rng):
+    """
+    Place exactly team_counts[i] live cells for each team in clusters of
+    CLUSTER_SIZE_RANGE cells, on arrays with an occupancy bitmap instead of
+    retrying single clusters. Returns flat cell indices per team.
+    """
+    occupied = np.zeros(width * height, dtype=bool)
+    placed = [[] for _ in team_counts]
+    remaining = np.array(team_counts)
+    low, high = CLUSTER_SIZE_RANGE
+    if remaining.sum() > width * height:
+        raise ValueError("more starting particles than cells")
+
+    while remaining.sum() > 0:
+        # Cluster sizes per team, the last one trimmed to the exact count
+        sizes, teams = [], []
+        for team, count in enumerate(remaining):
+            if count == 0:
+                continue
+            team_sizes = rng.integers(low, high + 1, size=count // low + 1)
+            ends = np.cumsum(team_sizes)
+            team_sizes = team_sizes[:np.searchsorted(ends, count) + 1]
+            team_sizes[-1] -= team_sizes.sum() - count
+            sizes.append(team_sizes)
+            teams.append(np.full(len(team_sizes), team))
+        sizes = np.concatenate(sizes)
+        teams = np.concatenate(teams)
+
+        # Seeds on free cells (clusters may still touch, as in GameOfLife6FAIL)
+        free = np.flatnonzero(~occupied)
+        if len(sizes) > len(free):
+            sizes, teams = sizes[:len(free)], teams[:len(free)]
+        seeds = free[rng.choice(len(free), size=len(sizes), replace=False)]
+        occupied[seeds] = True
+        members = np.zeros((len(sizes), sizes.max()), dtype=np.int64)
+        members[:, 0] = seeds
+        counts = np.ones(len(sizes), dtype=np.int64)
+        grow_clusters(width, height, occupied, members, counts, sizes, rng)
+
+        # Clusters that got boxed in keep what they have; the shortfall goes round again
+        for team in range(len(team_counts)):
+            mine = teams == team
+            cells = members[mine][np.arange(sizes.max()) < counts[mine][:, None]]
+            placed[team].append(cells)
+            remaining[team] -= len(cells)
+
+    return [np.concatenate(cells) if cells else np.zeros(0, dtype=np.int64) for cells in placed]
+
+
+def cluster_board(width, height, num_particles, rng):
+    """Board with num_particles cells in small clusters, half Blue, half Green."""
+    blue_cells, green_cells = place_clusters(width, height, (num_particles // 2, num_particles - num_particles // 2), rng)
+    alive = np.zeros(width * height, dtype=bool)
+    green = np.zeros(width * height, dtype=bool)
+    alive[blue_cells] = True
+    alive[green_cells] = True
+    green[green_cells] = True
+    return PackedBoard.from_cells(alive.reshape(height, width), green.reshape(height, width))
+
+
+# ----------------------------
+# Visuals
+# ----------------------------
+MIXED_COLOR = tuple((b + g) // 2 for b, g in zip(TEAM_COLORS["Blue"], TEAM_COLORS["Green"]))
+PALETTE = np.array([BACKGROUND_COLOR, TEAM_COLORS["Blue"], TEAM_COLORS["Green"],
+                    MIXED_COLOR, MIXED_COLOR], dtype=np.uint8)
+
+
+def board_codes(board):
+    """
+    (height, width) uint8 codes straight from the logic bits:
+    0 empty, 1 Blue, 2 Green, 3/4 Blue/Green converting (blended color).
+    """
+    alive, green = board.cells()
+    converting = board.unpack(board.converting)
+    return alive.view(np.uint8) + green.view(np.uint8) + 2 * converting.view(np.uint8)
+
+
+def board_surface(board):
+    """8-bit palette surface, one pixel per cell; cheaper than building RGB arrays."""
+    surface = pygame.surfarray.make_surface(board_codes(board).T)
+    surface.set_palette([tuple(color) for color in PALETTE])
+    return surface
+
+
+class VisualLayer:
+    """
+    Optional float layer holding the blended color and fade factor of every
+    cell, kept apart from the packed logic state.
+    """
+
+    def __init__(self, board):
+        codes = board_codes(board)
+        self.color = PALETTE[codes].astype(np.float32)
+        self.factor = (codes > 0).astype(np.float32)
+
+    def update(self, board):
+        codes = board_codes(board)
+        alive = codes > 0
+        self.factor += np.clip(alive - self.factor, -FADE_SPEED, FADE_SPEED)
+        # Dead cells keep their last color while they fade out
+        blend = (alive * np.float32(COLOR_BLEND_SPEED))[:, :, None]
+        self.color += (PALETTE[codes] - self.color) * blend
+
+    def pixels(self):
+        """(height, width, 3) uint8 colors faded over the background."""
+        background = np.array(BACKGROUND_COLOR, dtype=np.float32)
+        blended = background + (self.color - background) * self.factor[:, :, None]
+        return blended.astype(np.uint8)
+
+
+def render_text_with_border(screen, text, font, color, x, y):
+    black = (0, 0, 0)
+    offsets = [(-2, -2), (2, -2), (-2, 2), (2, 2)]
+    for ox, oy in offsets:
+        border_surface = font.render(text, True, black)
+        screen.blit(border_surface, (x + ox, y + oy))
+    text_surface = font.render(text, True, color)
+    screen.blit(text_surface, (x, y))
+
+
+def main():
+    pygame.init()
+    pygame.font.init()
+    font = pygame.font.SysFont("Arial", SCORE_FONT_SIZE)
+
+    rng = np.random.default_rng(SEED)
+    board = cluster_board(GRID_WIDTH, GRID_HEIGHT, NUM_STARTING_PARTICLES, rng)
+    visuals = VisualLayer(board) if SMOOTH_VISUALS else None
+
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Packed Particle Battle")
+    clock = pygame.time.Clock()
+
+    running = True
+    frame_count = 0
+
+    while running:
+        clock.tick(FPS)
+        time_elapsed = frame_count / FPS
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (
+               event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+
+        # Same phases as GameOfLife6FAIL: delay, battle, chaos ramp-down, freeze
+        if START_DELAY_SECONDS <= time_elapsed < BATTLE_END:
+            board.step(SEED, INITIAL_TOGGLE_RATE)
+        elif BATTLE_END <= time_elapsed < CALM_END:
+            ramp_progress = min(1.0, (time_elapsed - BATTLE_END) / CALM_DOWN_DURATION)
+            board.step(SEED, INITIAL_TOGGLE_RATE * (1.0 - ramp_progress))
+
+        # Cells are drawn one pixel each, then scaled for the zoom-out shot
+        if visuals is not None:
+            visuals.update(board)
+            render_surface = pygame.surfarray.make_surface(visuals.pixels().swapaxes(0, 1))
+        else:
+            render_surface = board_surface(board).convert()
+        if GRID_SIZE > 1:
+            render_surface = pygame.transform.scale(render_surface, (RENDER_WIDTH, RENDER_HEIGHT))
+        scaled_surface = pygame.transform.smoothscale(render_surface, (SCREEN_WIDTH, SCREEN_HEIGHT))
+        screen.blit(scaled_surface, (0, 0))
+
+        scores = board.population()
+        render_text_with_border(screen, f"Blue: {scores['Blue']}", font, TEAM_COLORS["Blue"], 10, 10)
+        render_text_with_border(screen, f"Green: {scores['Green']}", font, TEAM_COLORS["Green"], 10, 40)
+
+        pygame.display.flip()
+        frame_count += 1
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+import os
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+import time
+import pygame
+import numpy as np
+
+from GameOfLifePacked import (
+    PackedBoard, life_rows, chaos_rows, row_blocks, block_rng, make_row_mask, cluster_board,
+    board_surface, render_text_with_border,
+    SCREEN_WIDTH, SCREEN_HEIGHT, RENDER_WIDTH, RENDER_HEIGHT, GRID_SIZE, GRID_WIDTH, GRID_HEIGHT,
+    FPS, NUM_STARTING_PARTICLES, TEAM_COLORS, INITIAL_TOGGLE_RATE, SEED, SCORE_FONT_SIZE,
+    START_DELAY_SECONDS, BATTLE_END, CALM_DOWN_DURATION, CALM_END
+)
+
+# ----------------------------
+# Settings
+# ----------------------------
+WORKERS = os.cpu_count() or 1  # One horizontal strip per worker process
+PHASE_TIMEOUT = 30.0  # Seconds to wait for every strip to finish a phase before giving up
+
+PLANES = ("alive", "team", "converting")
+BUFFERS = ("front", "back")
+
+
+def attach_planes(names, shape):
+    """Map the shared-memory blocks of every buffer/plane to uint64 arrays."""
+    memory = {}
+    arrays = {}
+    for key, name in names.items():
+        memory[key] = shared_memory.SharedMemory(name=name)
+        arrays[key] = np.ndarray(shape, dtype=np.uint64, buffer=memory[key].buf)
+    return memory, arrays
+
+
+def strip_worker(names, shape, width, blocks, seed, conn):
+    """
+    Step one horizontal strip (a run of whole random-stream blocks) on the
+    parent's orders: ("life", generation) runs the life rules front -> back,
+    ("chaos", toggle_rate) applies the chaos flips back -> front, and each is
+    answered once done. The halo rows read from the neighboring strips are
+    always complete because the parent only starts a phase after every strip
+    has finished the previous one. None, or the parent going away, stops it.
+    """
+    memory, arrays = attach_planes(names, shape)
+    front = {plane: arrays[("front", plane)] for plane in PLANES}
+    back = {plane: arrays[("back", plane)] for plane in PLANES}
+    row_mask = make_row_mask(width)
+    rngs = {}
+
+    try:
+        while True:
+            try:
+                order = conn.recv()
+            except EOFError:
+                break
+            if order is None:
+                break
+            phase, value = order
+
+            if phase == "life":
+                for block, (r0, r1) in blocks:
+                    rngs[block] = block_rng(seed, int(value), block)
+                    back["alive"][r0:r1], back["team"][r0:r1], back["converting"][r0:r1] = life_rows(
+                        front["alive"], front["team"], row_mask, r0, r1, rngs[block])
+            else:
+                for block, (r0, r1) in blocks:
+                    if value > 0:
+                        flips = chaos_rows(back["alive"], back["team"], width, r0, r1, rngs[block], value)
+                    else:
+                        flips = np.zeros_like(back["team"][r0:r1])
+                    front["alive"][r0:r1] = back["alive"][r0:r1]
+                    front["team"][r0:r1] = back["team"][r0:r1] ^ flips
+                    front["converting"][r0:r1] = back["converting"][r0:r1] & ~flips
+            conn.send(phase)
+    finally:
+        for block_memory in memory.values():
+            block_memory.close()
+
+
+class ParallelStepper:
+    """
+    Steps a PackedBoard in horizontal strips, one worker process per strip,
+    over multiprocessing.shared_memory. Random streams are keyed per block of
+    rows exactly like PackedBoard.step, so for a given seed the result matches
+    the serial stepper whatever the number of workers.
+
+    The parent drives each phase over one pipe per worker and watches the
+    worker processes while it waits, so a worker that dies or hangs ends the
+    run with RuntimeError instead of blocking it forever.
+    """
+
+    def __init__(self, board, seed, workers=WORKERS):
+        self.seed = seed
+        shape = board.alive.shape
+        nbytes = board.alive.nbytes
+
+        self.memory = {}
+        names = {}
+        for buffer in BUFFERS:
+            for plane in PLANES:
+                block_memory = shared_memory.SharedMemory(create=True, size=nbytes)
+                self.memory[(buffer, plane)] = block_memory
+                names[(buffer, plane)] = block_memory.name
+        arrays = {key: np.ndarray(shape, dtype=np.uint64, buffer=block_memory.buf)
+                  for key, block_memory in self.memory.items()}
+
+        # The stepper's board is a view on the front buffer
+        self.board = PackedBoard(board.width, board.height)
+        self.board.generation = board.generation
+        for plane in PLANES:
+            arrays[("front", plane)][:] = getattr(board, plane)
+            setattr(self.board, plane, arrays[("front", plane)])
+
+        blocks = list(enumerate(row_blocks(board.height)))
+        strips = [strip for strip in np.array_split(np.arange(len(blocks)), workers) if len(strip)]
+
+        self.processes = []
+        self.conns = []
+        for strip in strips:
+            conn, worker_conn = mp.Pipe()
+            process = mp.Process(target=strip_worker,
+                                 args=(names, shape, board.width, [blocks[i] for i in strip],
+                                       seed, worker_conn),
+                                 daemon=True)
+            process.start()
+            worker_conn.close()
+            self.processes.append(process)
+            self.conns.append(conn)
+
+    def run_phase(self, order):
+        """Send one phase to every strip and wait until all of them report it done."""
+        try:
+            for conn in self.conns:
+                conn.send(order)
+            pending = set(self.conns)
+            sentinels = {process.sentinel: process for process in self.processes}
+            deadline = time.monotonic() + PHASE_TIMEOUT
+            while pending:
+                remaining = deadline - time.monotonic()
+                ready = wait(list(pending) + list(sentinels), max(remaining, 0))
+                if not ready:
+                    raise RuntimeError(f"strip workers took over {PHASE_TIMEOUT}s on {order[0]}")
+                for item in ready:
+                    if item in sentinels:
+                        raise RuntimeError(f"strip worker {sentinels[item].pid} exited "
+                                           f"(code {sentinels[item].exitcode})")
+                    item.recv()
+                    pending.discard(item)
+        except (OSError, EOFError) as error:
+            self.terminate()
+            raise RuntimeError(f"lost contact with a strip worker: {error}") from None
+        except RuntimeError:
+            self.terminate()
+            raise
+
+    def step(self, toggle_rate=0.0):
+        """Advance the shared board one generation."""
+        self.run_phase(("life", self.board.generation))
+        self.run_phase(("chaos", toggle_rate))
+        self.board.generation += 1
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        if not self.memory:
+            return
+        for conn in self.conns:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+        for process in self.processes:
+            process.join(PHASE_TIMEOUT)
+        self.terminate()
+
+    def terminate(self):
+        """Kill any workers still running and release the shared memory; the board keeps a copy."""
+        for process in self.processes:
+            if process.is_alive():
+                process.kill()  # SIGKILL also ends a stopped or wedged worker
+            process.join()
+        for conn in self.conns:
+            conn.close()
+        for plane in PLANES:
+            setattr(self.board, plane, getattr(self.board, plane).copy())
+        for block_memory in self.memory.values():
+            block_memory.close()
+            block_memory.unlink()
+        self.memory = {}
+
+
+def main():
+    pygame.init()
+    pygame.font.init()
+    font = pygame.font.SysFont("Arial", SCORE_FONT_SIZE)
+
+    rng = np.random.default_rng(SEED)
+    # Same starting board as the packed demo, so the two can be compared
+    stepper = ParallelStepper(cluster_board(GRID_WIDTH, GRID_HEIGHT, NUM_STARTING_PARTICLES, rng), SEED)
+
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Parallel Particle Battle")
+    clock = pygame.time.Clock()
+
+    running = True
+    frame_count = 0
+
+    try:
+        while running:
+            clock.tick(FPS)
+            time_elapsed = frame_count / FPS
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT or (
+                   event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                    running = False
+
+            if START_DELAY_SECONDS <= time_elapsed < BATTLE_END:
+                stepper.step(INITIAL_TOGGLE_RATE)
+            elif BATTLE_END <= time_elapsed < CALM_END:
+                ramp_progress = min(1.0, (time_elapsed - BATTLE_END) / CALM_DOWN_DURATION)
+                stepper.step(INITIAL_TOGGLE_RATE * (1.0 - ramp_progress))
+
+            render_surface = board_surface(stepper.board).convert()
+            if GRID_SIZE > 1:
+                render_surface = pygame.transform.scale(render_surface, (RENDER_WIDTH, RENDER_HEIGHT))
+            scaled_surface = pygame.transform.smoothscale(render_surface, (SCREEN_WIDTH, SCREEN_HEIGHT))
+            screen.blit(scaled_surface, (0, 0))
+
+            scores = stepper.board.population()
+            render_text_with_border(screen, f"Blue: {scores['Blue']}", font, TEAM_COLORS["Blue"], 10, 10)
+            render_text_with_border(screen, f"Green: {scores['Green']}", font, TEAM_COLORS["Green"], 10, 40)
+
+            pygame.display.flip()
+            frame_count += 1
+    finally:
+        stepper.close()
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
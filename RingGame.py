@@ -0,0 +1,145 @@
+import pygame
+from Box2D import b2ContactListener
+import numpy as np
+
+# Pieces shared by the ball-in-rings scripts (Sim4, supercoolrandomgalexy)
+
+###############################################################################
+# Collision filtering
+###############################################################################
+# Balls only touch rings (and each other if the script's BALLS_COLLIDE is set),
+# rings never touch rings, so the broadphase skips every other pair
+CATEGORY_BALL = 0x0001
+CATEGORY_RING = 0x0002
+RING_MASK = CATEGORY_BALL
+
+def ball_mask(balls_collide):
+    return CATEGORY_RING | (CATEGORY_BALL if balls_collide else 0)
+
+class MyContactListener(b2ContactListener):
+    # With the filtering above Box2D only makes ball-ring contacts (plus
+    # ball-ball ones), so this just counts the ones that begin
+    def __init__(self):
+        super(MyContactListener, self).__init__()
+        self.begun = 0
+
+    def BeginContact(self, contact):
+        self.begun += 1
+
+    def take_count(self):
+        # Contacts begun since the last call
+        count = self.begun
+        self.begun = 0
+        return count
+
+###############################################################################
+# Fixed steps
+###############################################################################
+def fixed_steps(accumulator, step_dt, max_steps):
+    # How many step_dt steps the accumulated frame time covers, and the time
+    # left over (accumulator / step_dt of the way to the next step, for
+    # drawing in between). After a stall of more than max_steps the backlog
+    # is dropped instead of caught up.
+    steps = 0
+    while accumulator >= step_dt and steps < max_steps:
+        accumulator -= step_dt
+        steps += 1
+    if steps == max_steps:
+        accumulator = min(accumulator, step_dt)
+    return steps, accumulator
+
+###############################################################################
+# Particle pool
+###############################################################################
+class ParticlePool:
+    # Every live particle in flat arrays, packed at the front [0, count).
+    # Bursts are spawned in bulk; update moves, ages and culls all of them in
+    # one pass, and draw stamps them straight into the screen's pixels.
+    # size, angle (degrees), speed and life are (min, max) ranges; speed and
+    # life are per 1/FRAMERATE frame.
+    def __init__(self, capacity, seed, per_burst, size, angle, speed, life):
+        self.capacity = capacity
+        self.count = 0
+        self.pos = np.zeros((capacity, 2))
+        self.vel = np.zeros((capacity, 2))
+        self.radius = np.zeros(capacity, dtype=np.int64)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self.life = np.zeros(capacity)
+        self.rng = np.random.default_rng(seed)
+        self.per_burst = per_burst
+        self.size_range = size
+        self.angle_range = angle
+        self.speed_range = speed
+        self.life_range = life
+        self.stamps = {r: circle_stamp(r) for r in range(int(size[1]) + 1)}
+
+    def burst(self, centers, color, per_center=None):
+        # per_center (default per_burst) particles at each (x, y) center, like
+        # one Explosion each
+        if per_center is None:
+            per_center = self.per_burst
+        centers = np.repeat(np.asarray(centers, dtype=float).reshape(-1, 2), per_center, axis=0)
+        n = len(centers)
+        if n == 0:
+            return
+        free = self.capacity - self.count
+        if n <= free:
+            slots = np.arange(self.count, self.count + n)
+            self.count += n
+        else:
+            # Pool is full: take the free slots, then recycle the particles closest to dying
+            n = min(n, self.capacity)
+            centers = centers[:n]
+            recycled = np.argpartition(self.life[:self.count], n - free - 1)[:n - free] if n > free else []
+            slots = np.concatenate((np.arange(self.count, self.capacity), recycled)).astype(np.int64)
+            self.count = self.capacity
+        angle = np.radians(self.rng.uniform(*self.angle_range, n))
+        speed = self.rng.uniform(*self.speed_range, n)
+        self.pos[slots] = centers
+        self.vel[slots, 0] = np.cos(angle) * speed
+        self.vel[slots, 1] = np.sin(angle) * speed
+        self.radius[slots] = self.rng.uniform(*self.size_range, n).astype(np.int64)
+        self.color[slots] = color
+        self.life[slots] = self.rng.integers(*self.life_range, n, endpoint=True)
+
+    def update(self, frames=1.0):
+        n = self.count
+        self.pos[:n] += self.vel[:n] * frames
+        self.life[:n] -= frames
+        keep = self.life[:n] > 0
+        self.count = int(keep.sum())
+        if self.count < n:
+            for array in (self.pos, self.vel, self.radius, self.color, self.life):
+                array[:self.count] = array[:n][keep]
+
+    def draw(self, screen):
+        n = self.count
+        if n == 0:
+            return
+        xy = self.pos[:n].astype(np.int64)  # int() truncation, as pygame.draw.circle was given
+        mapped = pygame.surfarray.map_array(screen, self.color[None, :n])[0]
+        pixels = pygame.surfarray.pixels2d(screen)
+        for r, (dx, dy) in self.stamps.items():
+            mine = self.radius[:n] == r
+            if not mine.any() or len(dx) == 0:
+                continue
+            stamp_pixels(pixels, xy[mine], np.repeat(mapped[mine], len(dx)), (dx, dy))
+        del pixels  # Unlock the screen
+
+
+def stamp_pixels(pixels, xy, colors, stamp):
+    # Write a stamp's footprint at every (x, y), clipped to the screen; colors
+    # is one mapped color, or one per pixel written
+    dx, dy = stamp
+    x = (xy[:, 0, None] + dx).ravel()
+    y = (xy[:, 1, None] + dy).ravel()
+    inside = (x >= 0) & (x < pixels.shape[0]) & (y >= 0) & (y < pixels.shape[1])
+    pixels[x[inside], y[inside]] = colors[inside] if np.ndim(colors) else colors
+
+def circle_stamp(radius):
+    # Pixel offsets pygame.draw.circle fills for this radius
+    size = 2 * radius + 3
+    surface = pygame.Surface((size, size))
+    pygame.draw.circle(surface, (255, 255, 255), (radius + 1, radius + 1), radius)
+    dx, dy = np.nonzero(pygame.surfarray.array2d(surface))
+    return dx - (radius + 1), dy - (radius + 1)
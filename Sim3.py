@@ -1,6 +1,7 @@
 import os
 import pygame
 import random
+from SongSnippets import SongSnippets
 
 # ------------------------------------------------------------------------
 # Configuration
@@ -105,10 +106,7 @@ SOUND_OPTION = 1
 # For Option 2: collision song based design (only active when SOUND_OPTION == 2)
 COLLISION_SONG_PATH = "TMOTTBG.mp3"  # Change as needed
 SOUND_SNIPPET_DURATION = 0.1   # Duration (in seconds) of each snippet played per collision
-SOUND_FADEOUT_MS = 20          # Fade-out duration in ms to smooth stopping
-COLLISION_SONG_TOTAL_DURATION = 180.0  # Total duration (in seconds) of the collision song (adjust as needed)
-collision_song_pos = 0.0       # Global tracker for current playback position
-COLLISION_SNIPPET_STOP_EVENT = pygame.USEREVENT + 1  # Custom event to stop snippet playback
+SOUND_FADE_MS = 20             # Fade-in/out (ms) at each snippet's edges
 
 # ------------------------------------------------------------------------
 # Pygame Initialization and Sound Loading
@@ -146,10 +144,11 @@ if os.path.exists("start.wav"):
     start_sound = pygame.mixer.Sound("start.wav")
     start_sound.set_volume(START_VOLUME_PERCENT / 100.0)
 
-# For SOUND_OPTION 2, load the collision song via pygame.mixer.music
+# For SOUND_OPTION 2, decode the collision song once for snippets
+collision_song = None
 if SOUND_OPTION == 2:
     if os.path.exists(COLLISION_SONG_PATH):
-        pygame.mixer.music.load(COLLISION_SONG_PATH)
+        collision_song = SongSnippets(COLLISION_SONG_PATH, SOUND_SNIPPET_DURATION, SOUND_FADE_MS)
     else:
         print("Collision song file not found!")
 
@@ -261,7 +260,7 @@ class Item:
         return distance_sq < (combined_radius * combined_radius)
 
     def resolve_collision(self, other, current_time):
-        global dominant_color, submissive_color, last_collision_sound_tick, collision_song_pos
+        global dominant_color, submissive_color, last_collision_sound_tick
         # Conversion if I'm dominant and the other is submissive
         if self.color == dominant_color and other.color == submissive_color:
             if (current_time - self.last_conversion_time) >= CONVERSION_COOLDOWN:
@@ -276,10 +275,9 @@ class Item:
                         collision_sound.play()
                         last_collision_sound_tick = current_tick
                 elif SOUND_OPTION == 2:
-                    if current_tick - last_collision_sound_tick > SOUND_COOLDOWN_MS and not pygame.mixer.music.get_busy():
-                        pygame.mixer.music.play(loops=0, start=collision_song_pos, fade_ms=20)
+                    if collision_song and current_tick - last_collision_sound_tick > SOUND_COOLDOWN_MS:
+                        collision_song.play()
                         last_collision_sound_tick = current_tick
-                        pygame.time.set_timer(COLLISION_SNIPPET_STOP_EVENT, int(SOUND_SNIPPET_DURATION * 1000))
         # Conversion if the other is dominant and I'm submissive
         elif other.color == dominant_color and self.color == submissive_color:
             if (current_time - other.last_conversion_time) >= CONVERSION_COOLDOWN:
@@ -294,10 +292,9 @@ class Item:
                         collision_sound.play()
                         last_collision_sound_tick = current_tick
                 elif SOUND_OPTION == 2:
-                    if current_tick - last_collision_sound_tick > SOUND_COOLDOWN_MS and not pygame.mixer.music.get_busy():
-                        pygame.mixer.music.play(loops=0, start=collision_song_pos, fade_ms=20)
+                    if collision_song and current_tick - last_collision_sound_tick > SOUND_COOLDOWN_MS:
+                        collision_song.play()
                         last_collision_sound_tick = current_tick
-                        pygame.time.set_timer(COLLISION_SNIPPET_STOP_EVENT, int(SOUND_SNIPPET_DURATION * 1000))
 
 # ------------------------------------------------------------------------
 # Create items for both teams
@@ -418,7 +415,7 @@ def draw_text_with_border(surface, text, font, text_color, border_color, pos, bo
     surface.blit(text_surface, pos)
 
 def main():
-    global dominant_color, submissive_color, collision_song_pos  # needed for option 2 updates
+    global dominant_color, submissive_color
 
     determine_initial_dominance()
     items = create_items(TEAM1_COUNT, TEAM2_COUNT, PARTICLE_SPEED, seed=SEED)
@@ -523,13 +520,6 @@ def main():
         for event in pygame.event.get():
             if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
                 running = False
-            # Handle collision snippet stop event for SOUND_OPTION 2
-            elif event.type == COLLISION_SNIPPET_STOP_EVENT:
-                pygame.mixer.music.fadeout(SOUND_FADEOUT_MS)
-                pygame.time.set_timer(COLLISION_SNIPPET_STOP_EVENT, 0)
-                collision_song_pos += SOUND_SNIPPET_DURATION
-                if collision_song_pos >= COLLISION_SONG_TOTAL_DURATION:
-                    collision_song_pos = 0.0
 
         # Time-based dominance logic
         check_last_items(items, elapsed_time)
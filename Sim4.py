@@ -3,10 +3,16 @@ import random
 import colorsys
 import pygame
 from pygame import Vector2, DOUBLEBUF, mixer
-from Box2D import b2World, b2ContactListener, b2EdgeShape
+from Box2D import b2World, b2EdgeShape, b2ChainShape
 import numpy as np
-import wave
 import os
+import itertools
+from collections import deque
+import multiprocessing as mp
+from SongSnippets import SongSnippets
+from RingGame import (
+    CATEGORY_BALL, CATEGORY_RING, RING_MASK, ball_mask, MyContactListener, fixed_steps,
+    ParticlePool, circle_stamp, stamp_pixels)
 
 ###############################################################################
 # CONFIGURABLE VARIABLES
@@ -18,6 +24,9 @@ SCREEN_HEIGHT = 768
 SCREEN_BACKGROUND_COLOR = (0, 0, 29)
 
 FRAMERATE = 60
+PHYSICS_HZ = 60            # Fixed logic/physics steps per second, independent of FRAMERATE
+PHYSICS_DT = 1.0 / PHYSICS_HZ
+MAX_STEPS_PER_FRAME = 8    # After a longer stall the backlog is dropped instead of caught up
 PPM = 10.0
 
 GRAVITY_MAG = 95
@@ -26,6 +35,9 @@ GRAVITY_ROT_SPEED = 0.0005
 BALL_RADIUS = 1
 BALL_COLOR = (255, 255, 255)
 
+BALLS_COLLIDE = False  # Balls touch each other too (see RingGame's collision filtering)
+BALL_MASK = ball_mask(BALLS_COLLIDE)
+
 NUM_RINGS = 55
 INITIAL_RING_RADIUS = 8
 RING_DISTANCE = 1.5
@@ -48,6 +60,7 @@ PARTICLE_SPEED_MIN = 0.6
 PARTICLE_SPEED_MAX = 1.25
 PARTICLE_LIFE_MIN = 10
 PARTICLE_LIFE_MAX = 100
+PARTICLE_POOL_SIZE = 20000  # Live particles at once; the oldest are recycled past this
 
 INITIAL_PAUSE_TIME = 3.0
 
@@ -78,51 +91,66 @@ DESTROY_SOUND_FILES = [
 ]
 
 # ---------------------------------------------------------------------------
-# Generate 8 short piano-style notes with extended cosine fade
+# Short piano-style notes with extended cosine fade, synthesized in memory
 # ---------------------------------------------------------------------------
-def generate_piano_scale(n_notes=8, base_midi=60, duration=0.18, sr=44100):
-    def midi_to_hz(m):        # MIDI → frequency
-        return 440.0 * 2 ** ((m - 69) / 12)
-
-    folder = "generated_notes"
-    os.makedirs(folder, exist_ok=True)
-    paths = []
-
-    fade_duration = 0.05  # 50 ms fade-in/out
-    fade_len = int(sr * fade_duration)
-
-    for i in range(n_notes):
-        freq = midi_to_hz(base_midi + i)
-        t = np.linspace(0, duration, int(sr * duration), endpoint=False)
-
-        wave_raw = (
-            0.6 * np.sin(2 * np.pi * freq * t)
-            + 0.3 * np.sin(2 * np.pi * freq * 2 * t)
-            + 0.1 * np.sin(2 * np.pi * freq * 3 * t)
-        )
-        envelope_body = np.exp(-4 * t)              # main decay
-        wave_raw *= envelope_body
-
-        # --- Cosine fade-in/out for smoother transitions ---
-        fade_in = 0.5 * (1 - np.cos(np.pi * np.arange(fade_len) / fade_len))
-        fade_out = 0.5 * (1 + np.cos(np.pi * np.arange(fade_len) / fade_len))
-        wave_raw[:fade_len] *= fade_in
-        wave_raw[-fade_len:] *= fade_out
-        # ---------------------------------------------------
-
-        wave_raw /= np.max(np.abs(wave_raw)) * 1.2  # Lower amplitude to prevent clipping
-
-        audio_i16 = (wave_raw * 32767).astype(np.int16)
-        fname = os.path.join(folder, f"note_{i}.wav")
-        with wave.open(fname, "wb") as wf:
-            wf.setnchannels(1)
-            wf.setsampwidth(2)
-            wf.setframerate(sr)
-            wf.writeframes(audio_i16.tobytes())
-        paths.append(fname)
-    return paths
-
-COLLISION_SOUND_FILES = generate_piano_scale()
+NOTE_DURATION = 0.18
+NOTE_CACHE_FOLDER = None  # e.g. "generated_notes" to keep the samples on disk between runs
+
+def midi_to_hz(m):        # MIDI → frequency
+    return 440.0 * 2 ** ((m - 69) / 12)
+
+def piano_note(midi, duration=NOTE_DURATION, sr=44100):
+    # One note as mono int16 samples
+    freq = midi_to_hz(midi)
+    t = np.linspace(0, duration, int(sr * duration), endpoint=False)
+
+    wave_raw = (
+        0.6 * np.sin(2 * np.pi * freq * t)
+        + 0.3 * np.sin(2 * np.pi * freq * 2 * t)
+        + 0.1 * np.sin(2 * np.pi * freq * 3 * t)
+    )
+    envelope_body = np.exp(-4 * t)              # main decay
+    wave_raw *= envelope_body
+
+    # --- Cosine fade-in/out for smoother transitions ---
+    fade_len = int(sr * 0.05)  # 50 ms fade-in/out
+    fade_in = 0.5 * (1 - np.cos(np.pi * np.arange(fade_len) / fade_len))
+    fade_out = 0.5 * (1 + np.cos(np.pi * np.arange(fade_len) / fade_len))
+    wave_raw[:fade_len] *= fade_in
+    wave_raw[-fade_len:] *= fade_out
+    # ---------------------------------------------------
+
+    wave_raw /= np.max(np.abs(wave_raw)) * 1.2  # Lower amplitude to prevent clipping
+    return (wave_raw * 32767).astype(np.int16)
+
+class NoteBank:
+    # Piano notes for any MIDI numbers, made straight into mixer Sounds at the
+    # mixer's rate and channel count (the mixer must be initialized). With a
+    # cache folder the samples are saved as .npy and loaded back next time.
+    def __init__(self, midi_notes, duration=NOTE_DURATION, cache_folder=NOTE_CACHE_FOLDER):
+        self.sr, _, self.channels = mixer.get_init()
+        self.duration = duration
+        self.cache_folder = cache_folder
+        if cache_folder:
+            os.makedirs(cache_folder, exist_ok=True)
+        self.sounds = [self.make_sound(midi) for midi in midi_notes]
+
+    def samples(self, midi):
+        if not self.cache_folder:
+            return piano_note(midi, self.duration, self.sr)
+        path = os.path.join(self.cache_folder,
+                            f"note_{midi}_{self.sr}_{int(self.duration * 1000)}ms.npy")
+        if os.path.exists(path):
+            return np.load(path)
+        data = piano_note(midi, self.duration, self.sr)
+        np.save(path, data)
+        return data
+
+    def make_sound(self, midi):
+        data = self.samples(midi)
+        if self.channels > 1:
+            data = np.repeat(data[:, np.newaxis], self.channels, axis=1)
+        return pygame.sndarray.make_sound(data)
 
 """
 COLLISION_SOUND_FILES = [
@@ -189,10 +217,13 @@ COLLISION_SOUND_FILES = [
 "boomkick.mp3",
 ]
 
+COLLISION_NOTES = None  # MIDI notes, e.g. range(60, 68), to play from a NoteBank instead of COLLISION_SOUND_FILES
+
 COLLISION_SOUND2 = "repo.mp3"
 
 SOUND_OPTION = 1
 SNIPPET_DURATION = 0.4
+SNIPPET_FADE_MS = 20  # Fade-in/out at each snippet's edges
 COLLISION_OVERLAP_BUFFER = 0.05  # Kept for reference, but now using play_interval
 play_interval = 80
 
@@ -209,6 +240,49 @@ SHRINK_SPEED2 = 3.70
 SHRINK_DELAY  = 0.13
 MINIMUM_SIZE  = 4.0  # minimum ring radius
 
+# How shrinking rings follow their radius:
+# "in_place"  moves the existing edge fixtures' vertices (no fixture churn; edges only)
+# "tolerance" rebuilds the fixtures only once the radius is RING_REBUILD_TOLERANCE off
+# "rebuild"   destroys and recreates every fixture on each change (original behavior)
+RING_GEOMETRY_MODE = "tolerance"
+# "chain" builds one b2ChainShape per contiguous arc (smooth joints, few fixtures),
+# "edges" one b2EdgeShape per segment. Chain vertices can't be rewritten, so chains
+# take "tolerance" or "rebuild".
+RING_SHAPE = "chain"
+
+# "box2d" runs the ball and rings in a Box2D world; "analytic" solves the one
+# ball against the circular rings directly (AnalyticGame), with continuous collision
+PHYSICS_BACKEND = "box2d"
+ANALYTIC_RESTITUTION = 1.1            # Box2D mixes ball 1.1 / ring 1.0 restitution by max
+ANALYTIC_RESTITUTION_THRESHOLD = 1.0  # m/s; slower impacts are inelastic, like b2_velocityThreshold
+ANALYTIC_MAX_SPEED = 120.0            # m/s; Box2D's 2 m per 1/60 s step translation cap
+ANALYTIC_MAX_IMPACTS = 8              # Bounces resolved within one step
+
+# Ring streaming: only the innermost ACTIVE_RING_WINDOW rings get physics bodies;
+# the rest are drawn only, and promoted as rings pop (None = every ring is a body).
+# INFINITE_RINGS keeps creating rings outward, out to the screen corners.
+ACTIVE_RING_WINDOW = None
+INFINITE_RINGS = False
+
+# Multi-ball mode: above 1, NUM_BALLS balls are kept in arrays (BallSwarm) and
+# run against the analytic rings (SwarmGame), whatever PHYSICS_BACKEND says.
+# This is not Box2D: every ball gets AnalyticGame's swept ball-vs-ring physics,
+# vectorized over the balls; the balls don't touch each other.
+NUM_BALLS = 1
+SWARM_BALL_RADIUS = 0.25  # meters
+SWARM_SPAWN_RADIUS = 4.0  # meters; balls start scattered over this disc
+
+# Headless search: run rounds with no display instead of the game (see search_seeds)
+HEADLESS_SEARCH = False
+SEARCH_SEEDS = range(1, 9)  # Only swept with NUM_BALLS > 1; a single-ball round doesn't depend on SEED
+SEARCH_OVERRIDES = {                   # other constants to sweep
+    "INITIAL_ROTATION_SPEED": [1.90, 1.96, 2.02],
+    "ROTATION_SPEED_MULTIPLIER": [1.006, 1.008, 1.010],
+    "GRAVITY_MAG": [90, 95, 100],
+}
+SEARCH_WORKERS = os.cpu_count() or 1
+RING_REBUILD_TOLERANCE = 0.25  # meters
+
 def gradient_color(t, color_start=(0, 0, 255), color_end=(255, 0, 0)):
     r = int(color_start[0] * (1 - t) + color_end[0] * t)
     g = int(color_start[1] * (1 - t) + color_end[1] * t)
@@ -217,42 +291,34 @@ def gradient_color(t, color_start=(0, 0, 255), color_end=(255, 0, 0)):
 
 random.seed(SEED)
 
-###############################################################################
-# MyContactListener
-###############################################################################
-class MyContactListener(b2ContactListener):
-    def __init__(self):
-        super(MyContactListener, self).__init__()
-        self.collisions = []
-
-    def BeginContact(self, contact):
-        fixtureA = contact.fixtureA
-        fixtureB = contact.fixtureB
-        bodyA = fixtureA.body
-        bodyB = fixtureB.body
-        if (isinstance(bodyA.userData, Ring) and isinstance(bodyB.userData, Ball)) \
-           or (isinstance(bodyA.userData, Ball) and isinstance(bodyB.userData, Ring)):
-            self.collisions.append((bodyA, bodyB))
-
-    def EndContact(self, contact):
-        pass
-
 ###############################################################################
 # Utils
 ###############################################################################
 class Utils:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, headless=False):
         self.width = SCREEN_WIDTH
         self.height = SCREEN_HEIGHT
-        self.screen = pygame.display.set_mode((self.width, self.height), DOUBLEBUF, 16)
+        if headless:
+            # No window, no clock: the caller advances time itself
+            pygame.font.init()
+            self.screen = None
+            self.clock = None
+        else:
+            pygame.init()
+            self.screen = pygame.display.set_mode((self.width, self.height), DOUBLEBUF, 16)
+            self.clock = pygame.time.Clock()
         self.dt = 0
-        self.clock = pygame.time.Clock()
+        self.frame_dt = 0
         self.PPM = PPM
-        self.world = b2World(gravity=(0, -GRAVITY_MAG), doSleep=True)
+        self.gravity = (0, -GRAVITY_MAG)  # Turned in advance(); the Box2D Game pushes it to its world
+        self.gravityAngle = -math.pi / 2
+        self.world = None  # Only the Box2D Game makes one (make_world)
+        self.contactListener = None
+
+    def make_world(self):
+        self.world = b2World(gravity=self.gravity, doSleep=True)
         self.contactListener = MyContactListener()
         self.world.contactListener = self.contactListener
-        self.gravityAngle = -math.pi / 2
 
     def to_Pos(self, pos):
         return (pos[0] * self.PPM, self.height - (pos[1] * self.PPM))
@@ -261,12 +327,17 @@ class Utils:
         return (pos[0] / self.PPM, (self.height - pos[1]) / self.PPM)
 
     def calDeltaTime(self):
+        # Real time since the last frame; game time only moves in advance()
         t = self.clock.tick(FRAMERATE)
-        self.dt = t / 1000
+        self.frame_dt = t / 1000
+        return self.frame_dt
+
+    def advance(self, dt):
+        self.dt = dt
         self.gravityAngle += GRAVITY_ROT_SPEED * self.dt
         gx = GRAVITY_MAG * math.cos(self.gravityAngle)
         gy = GRAVITY_MAG * math.sin(self.gravityAngle)
-        self.world.gravity = (gx, gy)
+        self.gravity = (gx, gy)
 
     def deltaTime(self):
         return self.dt
@@ -285,19 +356,26 @@ class Ball:
         self.radius = radius
         self.circle_body = utils.world.CreateDynamicBody(position=utils.from_Pos((pos.x, pos.y)))
         self.circle_shape = self.circle_body.CreateCircleFixture(
-            radius=self.radius, density=1, friction=0.0, restitution=1.1
+            radius=self.radius, density=1, friction=0.0, restitution=1.1,
+            categoryBits=CATEGORY_BALL, maskBits=BALL_MASK
         )
         self.circle_body.userData = self
-        self.destroyFlag = False
+        self.prev_pos = self.world_pos()
 
-    def draw(self):
+    def world_pos(self):
+        return self.circle_body.position.copy()
+
+    def draw(self, alpha=1.0):
         global utils
         for fixture in self.circle_body.fixtures:
-            self.draw_circle(fixture.shape, self.circle_body, fixture)
+            self.draw_circle(fixture.shape, self.circle_body, fixture, alpha)
 
-    def draw_circle(self, circle, body, fixture):
+    def draw_circle(self, circle, body, fixture, alpha=1.0):
         global utils
-        position = utils.to_Pos(body.transform * circle.pos)
+        # Between the last two physics steps, alpha of the way to the current one
+        current = body.transform * circle.pos
+        previous = self.prev_pos + circle.pos
+        position = utils.to_Pos(previous + (current - previous) * alpha)
         pygame.draw.circle(utils.screen, self.color, [int(x) for x in position],
                            int(circle.radius * utils.PPM))
 
@@ -306,167 +384,200 @@ class Ball:
         p = utils.to_Pos(self.circle_body.position)
         return Vector2(p[0], p[1])
 
-###############################################################################
-# Particle and Explosion
-###############################################################################
-class Particle:
-    def __init__(self, x, y, color):
-        self.radius = random.uniform(PARTICLE_SIZE_MIN, PARTICLE_SIZE_MAX)
-        angle = random.uniform(PARTICLE_ANGLE_MIN, PARTICLE_ANGLE_MAX)
-        speed = random.uniform(PARTICLE_SPEED_MIN, PARTICLE_SPEED_MAX)
-        self.x = x
-        self.y = y
-        self.color = color
-        self.vel_x = math.cos(math.radians(angle)) * speed
-        self.vel_y = math.sin(math.radians(angle)) * speed
-        self.life = random.randint(PARTICLE_LIFE_MIN, PARTICLE_LIFE_MAX)
-
-    def update(self):
-        self.x += self.vel_x
-        self.y += self.vel_y
-        self.life -= 1
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), int(self.radius))
-
-class Explosion:
-    def __init__(self, x, y, color):
-        self.particles = []
-        for _ in range(PARTICLE_COUNT):
-            particle = Particle(x, y, color)
-            self.particles.append(particle)
-
-    def update(self):
-        for particle in self.particles:
-            particle.update()
-        self.particles = [p for p in self.particles if p.life > 0]
-
-    def draw(self):
-        global utils
-        for particle in self.particles:
-            particle.draw(utils.screen)
-
 ###############################################################################
 # Ring
 ###############################################################################
 class Ring:
-    def __init__(self, pos, radius, rotateDir, size, hue):
+    def __init__(self, pos, radius, rotateDir, size, hue, angle=0.0):
         global utils
-        self.color = (255, 255, 255)
-        self.radius = radius
-        self.rotateDir = rotateDir
-        self.size = size
-        self.vertices = []
-        for i in range(self.size):
-            angle = i * (2 * math.pi / self.size)
-            x = radius * math.cos(angle)
-            y = radius * math.sin(angle)
-            self.vertices.append((x, y))
+        if RING_GEOMETRY_MODE == "in_place" and RING_SHAPE == "chain":
+            raise ValueError('chain rings can\'t be moved "in_place"; use "tolerance" or "rebuild"')
+        self.setup_ring(radius, rotateDir, size, hue)
 
-        self.body = utils.world.CreateStaticBody(position=utils.from_Pos(pos))
+        # Kinematic: the solver turns the ring at rotateDir rad/s on every world step
+        self.body = utils.world.CreateKinematicBody(position=utils.from_Pos(pos), angle=angle,
+                                                    angularVelocity=rotateDir)
         self.body.userData = self
+        self.prev_angle = self.body.angle
 
         self.create_edge_shape()
+
+    def setup_ring(self, radius, rotateDir, size, hue):
+        # Everything but the pose and the shape, shared with RingOutline
+        self.color = (255, 255, 255)
+        self.radius = radius
+        self.rotateDir = rotateDir
+        self.size = size
         self.hue = hue
-        self.destroyFlag = False
-        self.transformed_vertices = []  # Cache for transformed vertices
+        self.compute_vertices()
 
-    def create_edge_shape(self):
+    def ring_arcs(self):
+        # Each contiguous stretch of wall as one polyline; the gap sits between arcs
+        arcs = []
         if self.size == RING_SEGMENT_COUNT:
+            arc = [self.vertices[0]]
             for i in range(self.size):
                 angle = i * (360 / self.size)
                 if 0 <= angle <= CIRCLE_GAP_END_ANGLE:
-                    v1 = self.vertices[i]
-                    v2 = self.vertices[(i + 1) % self.size]
-                    edge = b2EdgeShape(vertices=[v1, v2])
-                    self.body.CreateEdgeFixture(
-                        shape=edge, density=1, friction=0.0, restitution=1.0
-                    )
+                    arc.append(self.vertices[(i + 1) % self.size])
+            arcs.append(arc)
         if self.size == TRIANGLE_SIZE or self.size == SQUARE_SIZE:
-            for i in range(self.size):
-                if i == 0:
-                    holeSize = 4
-                    v1 = Vector2(self.vertices[i])
-                    v2 = Vector2(self.vertices[(i + 1) % self.size])
-                    length = (v2 - v1).length()
-                    dir_vec = (v2 - v1).normalize()
-                    mV1 = v1 + dir_vec * (length / 2 - holeSize)
-                    mV2 = v1 + dir_vec * (length / 2 + holeSize)
-                    edge = b2EdgeShape(vertices=[v1, mV1])
-                    self.body.CreateEdgeFixture(
-                        shape=edge, density=1, friction=0.0, restitution=1.0
-                    )
-                    edge = b2EdgeShape(vertices=[mV2, v2])
-                    self.body.CreateEdgeFixture(
-                        shape=edge, density=1, friction=0.0, restitution=1.0
-                    )
-                else:
-                    v1 = self.vertices[i]
-                    v2 = self.vertices[(i + 1) % self.size]
-                    edge = b2EdgeShape(vertices=[v1, v2])
-                    self.body.CreateEdgeFixture(
-                        shape=edge, density=1, friction=0.0, restitution=1.0
-                    )
+            # Hole in the middle of side 0: the wall runs mV2 -> v1 -> ... -> v0 -> mV1
+            holeSize = 4
+            v1 = Vector2(self.vertices[0])
+            v2 = Vector2(self.vertices[1])
+            length = (v2 - v1).length()
+            dir_vec = (v2 - v1).normalize()
+            mV1 = v1 + dir_vec * (length / 2 - holeSize)
+            mV2 = v1 + dir_vec * (length / 2 + holeSize)
+            arcs.append([tuple(mV2)] + self.vertices[1:] + [self.vertices[0], tuple(mV1)])
+        return arcs
+
+    def edge_segments(self):
+        segments = []
+        for arc in self.ring_arcs():
+            segments += zip(arc[:-1], arc[1:])
+        return segments
 
-    def update_collision_shape(self):
-        for fixture in list(self.body.fixtures):
-            self.body.DestroyFixture(fixture)
+    def create_edge_shape(self):
+        self.edge_fixtures = []
+        if RING_SHAPE == "chain":
+            for arc in self.ring_arcs():
+                chain = b2ChainShape(vertices_chain=arc)
+                self.edge_fixtures.append(self.body.CreateChainFixture(
+                    shape=chain, density=1, friction=0.0, restitution=1.0,
+                    categoryBits=CATEGORY_RING, maskBits=RING_MASK
+                ))
+        else:
+            for v1, v2 in self.edge_segments():
+                edge = b2EdgeShape(vertices=[v1, v2])
+                self.edge_fixtures.append(self.body.CreateEdgeFixture(
+                    shape=edge, density=1, friction=0.0, restitution=1.0,
+                    categoryBits=CATEGORY_RING, maskBits=RING_MASK
+                ))
+        self.shape_radius = self.radius
+        self.local_arcs = [np.array(arc) for arc in self.ring_arcs()]
+
+    def compute_vertices(self):
         self.vertices = []
         for i in range(self.size):
             angle = i * (2 * math.pi / self.size)
             x = self.radius * math.cos(angle)
             y = self.radius * math.sin(angle)
             self.vertices.append((x, y))
+
+    def update_collision_shape(self):
+        for fixture in list(self.body.fixtures):
+            self.body.DestroyFixture(fixture)
+        self.compute_vertices()
         self.create_edge_shape()
 
-    def update_shrink(self, dt, min_allowed=0):
-        old_radius = self.radius
-        if self.radius > INITIAL_RING_RADIUS:
-            new_radius = max(self.radius - SHRINK_SPEED1 * dt, INITIAL_RING_RADIUS)
-        else:
-            new_radius = max(self.radius - SHRINK_SPEED2 * dt, 0)
-        if new_radius < min_allowed:
-            new_radius = min_allowed
-        if new_radius < MINIMUM_SIZE:   # clamp to minimum size
-            new_radius = MINIMUM_SIZE
+    def move_collision_shape(self):
+        # Same segments at the new radius, written into the existing fixtures
+        # (edges only: chain vertices can't be rewritten)
+        self.compute_vertices()
+        for fixture, (v1, v2) in zip(self.edge_fixtures, self.edge_segments()):
+            fixture.shape.vertices = [v1, v2]
+        # Re-sync the broadphase proxies with the moved edges
+        self.body.transform = (self.body.position, self.body.angle)
+        self.shape_radius = self.radius
+        self.local_arcs = [np.array(arc) for arc in self.ring_arcs()]
+
+    def resize(self, new_radius):
+        # Called only when the shrink (Game.shrink_rings) moved this ring
         self.radius = new_radius
-        if self.radius != old_radius:
+        if RING_GEOMETRY_MODE == "rebuild":
             self.update_collision_shape()
+        elif RING_GEOMETRY_MODE == "in_place":
+            self.move_collision_shape()
+        elif abs(self.radius - self.shape_radius) > RING_REBUILD_TOLERANCE \
+                or self.radius == MINIMUM_SIZE:
+            # "tolerance": rebuild the fixtures only once they are far enough off
+            self.update_collision_shape()
+        else:
+            # The drawing still follows every change
+            self.compute_vertices()
+            self.local_arcs = [np.array(arc) for arc in self.ring_arcs()]
+
+    def frame(self, alpha=1.0):
+        # World position and angle the local arcs are drawn in, alpha of the
+        # way from the previous physics step to the current one
+        angle = self.prev_angle + (self.body.angle - self.prev_angle) * alpha
+        return tuple(self.body.position), angle
 
-    def draw(self, paused=False):
+    def draw(self, screen_arcs, paused=False):
         global utils, COLOR_SETTING
         if not paused:
-            self.hue = (self.hue + utils.deltaTime() / 5) % 1
-            self.body.angle += self.rotateDir * utils.deltaTime()
+            self.hue = (self.hue + utils.frame_dt / 5) % 1
         if COLOR_SETTING == 1:
             self.color = utils.hueToRGB(self.hue)
         elif COLOR_SETTING == 2:
             self.color = gradient_color(self.hue)
-        self.draw_edges()
+        self.draw_edges(screen_arcs)
+
+    def draw_edges(self, screen_arcs):
+        global utils
+        for arc in screen_arcs:
+            pygame.draw.lines(utils.screen, self.color, False, arc, RING_LINE_THICKNESS)
 
-    def draw_edges(self):
+    def spawParticles(self, pool):
         global utils
-        # Cache transformed vertices
-        self.transformed_vertices = []
-        for fixture in self.body.fixtures:
-            v1 = utils.to_Pos(self.body.transform * fixture.shape.vertices[0])
-            v2 = utils.to_Pos(self.body.transform * fixture.shape.vertices[1])
-            self.transformed_vertices.append((v1, v2))
-        # Draw all lines in one go
-        for v1, v2 in self.transformed_vertices:
-            pygame.draw.line(utils.screen, self.color, v1, v2, RING_LINE_THICKNESS)
-
-    def spawParticles(self):
+        # One burst every 5 degrees around the popped ring
+        angles = np.radians(np.arange(0, 360, 5))
+        centers = np.column_stack((utils.width / 2 + np.cos(angles) * self.radius * 10,
+                                   utils.height / 2 + np.sin(angles) * self.radius * 10))
+        pool.burst(centers, self.color)
+
+class RingOutline(Ring):
+    # A ring with no physics body: its arcs are only drawn, and its angle is
+    # turned by whoever owns it
+    def __init__(self, pos, radius, rotateDir, size, hue, angle=0.0):
         global utils
-        particles = []
-        center = Vector2(utils.width / 2, utils.height / 2)
-        for i in range(0, 360, 5):
-            x = math.cos(math.radians(i)) * self.radius * 10
-            y = math.sin(math.radians(i)) * self.radius * 10
-            pos = center + Vector2(x, y)
-            exp = Explosion(pos.x, pos.y, self.color)
-            particles.append(exp)
-        return particles
+        self.setup_ring(radius, rotateDir, size, hue)
+        self.position = np.array(utils.from_Pos(pos), dtype=float)
+        self.angle = angle
+        self.prev_angle = angle
+        self.create_edge_shape()
+
+    def create_edge_shape(self):
+        self.shape_radius = self.radius
+        self.local_arcs = [np.array(arc) for arc in self.ring_arcs()]
+
+    def update_collision_shape(self):
+        self.compute_vertices()
+        self.create_edge_shape()
+
+    def move_collision_shape(self):
+        self.update_collision_shape()
+
+    def frame(self, alpha=1.0):
+        return tuple(self.position), self.prev_angle + (self.angle - self.prev_angle) * alpha
+
+def ring_screen_arcs(rings, alpha=1.0):
+    """
+    Screen-space polylines of every ring, from the cached local arcs. All
+    rings are rotated and mapped to pixels in one vectorized pass; returns
+    one list of (N, 2) arrays per ring.
+    """
+    global utils
+    arcs = [arc for ring in rings for arc in ring.local_arcs]
+    if not arcs:
+        return [[] for _ in rings]
+    counts = [len(arc) for arc in arcs]
+    frames = [ring.frame(alpha) for ring in rings for _ in ring.local_arcs]
+    angles = np.array([angle for _, angle in frames])
+    cos, sin = np.cos(angles), np.sin(angles)
+    rotations = np.stack((np.stack((cos, -sin), 1), np.stack((sin, cos), 1)), 1)
+    origins = np.array([position for position, _ in frames])
+
+    arc_index = np.repeat(np.arange(len(arcs)), counts)
+    points = np.einsum("nij,nj->ni", rotations[arc_index], np.concatenate(arcs))
+    points += origins[arc_index]
+    points *= utils.PPM
+    points[:, 1] = utils.height - points[:, 1]
+
+    screen_arcs = iter(np.split(points, np.cumsum(counts)[:-1]))
+    return [[next(screen_arcs) for _ in ring.local_arcs] for ring in rings]
 
 ###############################################################################
 # Sounds
@@ -480,17 +591,16 @@ class Sounds:
         self.destroyIndex = 0
 
         if SOUND_OPTION == 1:
-            self.sounds = [pygame.mixer.Sound(f) for f in COLLISION_SOUND_FILES]
+            if COLLISION_NOTES is not None:
+                self.sounds = NoteBank(COLLISION_NOTES).sounds
+            else:
+                self.sounds = [pygame.mixer.Sound(f) for f in COLLISION_SOUND_FILES]
             for s in self.sounds:
                 s.set_volume(COLLISION_VOLUME)
             self.i = 0
         elif SOUND_OPTION == 2:
-            self.collision_file = COLLISION_SOUND2
-            pygame.mixer.music.load(self.collision_file)
-            self.collisionSoundLength = pygame.mixer.Sound(self.collision_file).get_length()
-            pygame.mixer.music.set_volume(COLLISION_VOLUME)
-            self.current_pos = 0.0
-            self.snippet_end_time = 0
+            self.snippets = SongSnippets(COLLISION_SOUND2, SNIPPET_DURATION, SNIPPET_FADE_MS,
+                                         COLLISION_VOLUME)
 
         self.last_play_time = 0
         self.play_interval = play_interval  # 100 ms buffer between sound plays
@@ -508,31 +618,23 @@ class Sounds:
             sound.play()
             self.i = (self.i + 1) % len(self.sounds)
         elif SOUND_OPTION == 2:
-            # Play snippet if mixer is free
-            if pygame.mixer.music.get_busy():
-                return
-            remaining_time = self.collisionSoundLength - self.current_pos
-            duration = min(SNIPPET_DURATION, remaining_time)
-            pygame.mixer.music.play(start=self.current_pos)
-            self.snippet_end_time = current_time + int(duration * 1000)
+            self.snippets.play()
         # Update the last play time
         self.last_play_time = current_time
 
-    def update(self):
-        if SOUND_OPTION == 2:
-            current_time = pygame.time.get_ticks()
-            if self.snippet_end_time and current_time >= self.snippet_end_time:
-                pygame.mixer.music.stop()
-                self.snippet_end_time = 0
-                self.current_pos += SNIPPET_DURATION
-                if self.current_pos >= self.collisionSoundLength:
-                    self.current_pos = 0.0
-
     def playDestroySound(self):
         sound = self.destroySounds[self.destroyIndex]
         sound.play()
         self.destroyIndex = (self.destroyIndex + 1) % len(self.destroySounds)
 
+class NoSounds:
+    # Stands in for Sounds in headless runs
+    def play(self):
+        pass
+
+    def playDestroySound(self):
+        pass
+
 ###############################################################################
 # Game
 ###############################################################################
@@ -540,90 +642,192 @@ class Game:
     def __init__(self):
         global utils, sounds
 
+        self.make_world()
         self.center = Vector2(utils.width / 2, utils.height / 2)
-        self.ball = Ball(Vector2(utils.width / 2, utils.height / 2),
-                         BALL_RADIUS, BALL_COLOR)
-        self.particles = []
-        self.rings = []
+        self.ball = self.make_ball(Vector2(utils.width / 2, utils.height / 2),
+                                   BALL_RADIUS, BALL_COLOR)
+        self.particles = ParticlePool(PARTICLE_POOL_SIZE, SEED, PARTICLE_COUNT,
+                                      (PARTICLE_SIZE_MIN, PARTICLE_SIZE_MAX),
+                                      (PARTICLE_ANGLE_MIN, PARTICLE_ANGLE_MAX),
+                                      (PARTICLE_SPEED_MIN, PARTICLE_SPEED_MAX),
+                                      (PARTICLE_LIFE_MIN, PARTICLE_LIFE_MAX))
+        self.rings = deque()        # Rings with physics, innermost first; only [0] can pop
+        self.outer_rings = deque()  # Draw-only rings outside them (see add_rings)
+        self.radii = np.zeros(0)    # Radius of every ring, inner and outer, in order
         self.collision_count = 0
         self.collision_happened_last_frame = False
         self.font = pygame.font.Font(None, 36)
         self.elapsed_time = 0
         self.last_pop_time = None
-        radius = INITIAL_RING_RADIUS
-        rotateSpeed = INITIAL_ROTATION_SPEED
-        hue = INITIAL_HUE
-        for _ in range(NUM_RINGS):
-            ring = Ring(self.center, radius, rotateSpeed, RING_SEGMENT_COUNT, hue)
-            radius += RING_DISTANCE
-            rotateSpeed *= ROTATION_SPEED_MULTIPLIER
-            hue += 1 / NUM_RINGS
-            self.rings.append(ring)
+        self.rings_made = 0
+        self.rings_popped = 0
+        self.next_rotate_speed = INITIAL_ROTATION_SPEED
+        self.next_hue = INITIAL_HUE
+        self.add_rings()
         self.game_over = False
         self.win = False
 
-    def update(self):
-        if self.game_over or self.win:
-            for exp in self.particles:
-                exp.update()
-            self.particles = [exp for exp in self.particles if len(exp.particles) > 0]
+    # -- physics backend hooks (Box2D here, see AnalyticGame) --
+    def make_world(self):
+        utils.make_world()
+
+    def make_ball(self, pos, radius, color):
+        return Ball(pos, radius, color)
+
+    def make_ring(self, pos, radius, rotateDir, size, hue, angle=0.0):
+        return Ring(pos, radius, rotateDir, size, hue, angle)
+
+    # -- ring streaming --
+    def all_rings(self):
+        return list(itertools.chain(self.rings, self.outer_rings))
+
+    def more_rings(self):
+        return INFINITE_RINGS or self.rings_made < NUM_RINGS
+
+    def next_ring(self, physics):
+        # The next ring outward, RING_DISTANCE outside the current outermost one
+        radius = self.radii[-1] + RING_DISTANCE if len(self.radii) else INITIAL_RING_RADIUS
+        make = self.make_ring if physics else RingOutline
+        ring = make(self.center, radius, self.next_rotate_speed, RING_SEGMENT_COUNT, self.next_hue)
+        self.radii = np.append(self.radii, radius)
+        self.rings_made += 1
+        self.next_rotate_speed *= ROTATION_SPEED_MULTIPLIER
+        self.next_hue += 1 / NUM_RINGS
+        return ring
+
+    def add_rings(self):
+        # Keep ACTIVE_RING_WINDOW physics rings, promoting draw-only rings
+        # inward as rings pop, then draw-only rings out to the screen corners
+        # (infinite mode) or up to NUM_RINGS
+        window = ACTIVE_RING_WINDOW or NUM_RINGS
+        while len(self.rings) < window and (self.outer_rings or self.more_rings()):
+            if self.outer_rings:
+                outline = self.outer_rings.popleft()
+                ring = self.make_ring(self.center, outline.radius, outline.rotateDir,
+                                      outline.size, outline.hue, outline.angle)
+            else:
+                ring = self.next_ring(physics=True)
+            self.rings.append(ring)
+        visible_radius = math.hypot(utils.width, utils.height) / 2 / utils.PPM
+        while self.more_rings():
+            outermost = self.radii[-1] if len(self.radii) else 0
+            if INFINITE_RINGS and outermost + RING_DISTANCE > visible_radius:
+                break
+            self.outer_rings.append(self.next_ring(physics=False))
+
+    def shrink_rings(self, dt):
+        # Every ring shrinks at its speed, but stays RING_DISTANCE outside the
+        # one inside it and at least MINIMUM_SIZE: new[i] = max(shrunk[i],
+        # new[i-1] + RING_DISTANCE), which is a running maximum once each
+        # ring's offset i * RING_DISTANCE is taken out
+        radii = self.radii
+        shrunk = np.where(radii > INITIAL_RING_RADIUS,
+                          np.maximum(radii - SHRINK_SPEED1 * dt, INITIAL_RING_RADIUS),
+                          np.maximum(radii - SHRINK_SPEED2 * dt, 0))
+        shrunk = np.maximum(shrunk, MINIMUM_SIZE)
+        offsets = np.arange(len(radii)) * RING_DISTANCE
+        new_radii = np.maximum.accumulate(shrunk - offsets) + offsets
+        changed = np.flatnonzero(np.abs(new_radii - radii) > 1e-9)
+        if len(changed) == 0:
             return
+        self.radii = np.where(np.abs(new_radii - radii) > 1e-9, new_radii, radii)
+        rings = self.all_rings()
+        for i in changed:
+            rings[i].resize(self.radii[i])
+
+    def turn_outer_rings(self):
+        for ring in self.outer_rings:
+            ring.angle += ring.rotateDir * utils.deltaTime()
+
+    def step_physics(self):
+        # keep original solver iterations; returns the ball-ring contacts begun
+        utils.world.gravity = utils.gravity
+        utils.world.Step(PHYSICS_DT, 6, 2)
+        return utils.contactListener.take_count()
+
+    def turn_rings(self):
+        # The rings' own turn, without stepping the world (and the ball with it)
+        for ring in self.rings:
+            ring.body.transform = (ring.body.position,
+                                   ring.body.angle + ring.rotateDir * utils.deltaTime())
 
-        global utils, sounds
+    def destroy_ring(self, ring):
+        utils.world.DestroyBody(ring.body)
 
-        # keep original solver iterations
-        utils.world.Step(1.0 / 60.0, 6, 2)
+    def destroy_ball(self):
+        ball_pos = self.ball.getPos()
+        self.particles.burst([(ball_pos.x, ball_pos.y)], BALL_COLOR)
+        utils.world.DestroyBody(self.ball.circle_body)
+        self.ball = None
 
-        self.elapsed_time += utils.deltaTime()
+    def ball_escaped(self):
+        # Is the ball outside the innermost ring?
+        return self.center.distance_to(self.ball.getPos()) > self.radii[0] * utils.PPM
 
-        collision_events = len(utils.contactListener.collisions)
+    def collision_sound(self, collision_events):
+        # One sound as the ball starts touching walls, none while it stays in contact
         if collision_events > 0:
-            self.collision_count += collision_events
             if not self.collision_happened_last_frame:
                 sounds.play()
                 self.collision_happened_last_frame = True
         else:
             self.collision_happened_last_frame = False
-        utils.contactListener.collisions = []
-
-        # detect when the innermost ring “escapes” the ball → mark for pop
-        if self.rings and self.center.distance_to(self.ball.getPos()) > self.rings[0].radius * 10:
-            first = self.rings[0]
-            first.destroyFlag = True
-            # deactivate physics so Box2D ignores it
-            first.body.active = False
-            self.last_pop_time = self.elapsed_time
 
-        # handle all popped rings in one pass
-        for ring in self.rings[:]:
-            if ring.destroyFlag:
-                self.particles += ring.spawParticles()
-                utils.world.DestroyBody(ring.body)
-                self.rings.remove(ring)
-                sounds.playDestroySound()
+    def save_previous(self):
+        # Poses before this step, for drawing in between steps
+        for ring in self.all_rings():
+            ring.prev_angle = ring.frame()[1]
+        if self.ball is not None:
+            self.ball.prev_pos = self.ball.world_pos()
+
+    def update(self):
+        global utils, sounds
+
+        self.save_previous()
+        particle_frames = utils.deltaTime() * FRAMERATE
+
+        if self.game_over or self.win:
+            # Rings keep turning after the round ends; the ball stays put
+            self.turn_rings()
+            self.turn_outer_rings()
+            self.particles.update(particle_frames)
+            return
+
+        collision_events = self.step_physics()
+        self.turn_outer_rings()
+
+        self.elapsed_time += utils.deltaTime()
+
+        self.collision_count += collision_events
+        self.collision_sound(collision_events)
+
+        # when the ball escapes the innermost ring, pop it off the front
+        if self.rings and self.ball_escaped():
+            ring = self.rings.popleft()
+            self.radii = self.radii[1:]
+            self.last_pop_time = self.elapsed_time
+            ring.spawParticles(self.particles)
+            self.destroy_ring(ring)
+            self.rings_popped += 1
+            sounds.playDestroySound()
+            self.add_rings()
 
         # shrink remaining rings after delay
         if self.last_pop_time is not None and (self.elapsed_time - self.last_pop_time) >= SHRINK_DELAY:
-            dt = utils.deltaTime()
-            for i, ring in enumerate(self.rings):
-                if i == 0:
-                    ring.update_shrink(dt, min_allowed=0)
-                else:
-                    min_allowed = self.rings[i-1].radius + RING_DISTANCE
-                    ring.update_shrink(dt, min_allowed=min_allowed)
-
-        for exp in self.particles:
-            exp.update()
-        self.particles = [exp for exp in self.particles if len(exp.particles) > 0]
-
-    def draw(self, paused=False, timer_value=None):
+            self.shrink_rings(utils.deltaTime())
+            if INFINITE_RINGS:
+                self.add_rings()  # Fill in the space the shrink opened at the edge
+
+        self.particles.update(particle_frames)
+
+    def draw(self, paused=False, timer_value=None, alpha=1.0):
         global utils
-        for ring in self.rings:
-            ring.draw(paused=paused)
+        rings = self.all_rings()
+        for ring, screen_arcs in zip(rings, ring_screen_arcs(rings, alpha)):
+            ring.draw(screen_arcs, paused=paused)
         if self.ball is not None:
-            self.ball.draw()
-        for exp in self.particles:
-            exp.draw()
+            self.ball.draw(alpha)
+        self.particles.draw(utils.screen)
         text_surface = self.font.render(f"Bounces: {self.collision_count}", True, TEXT_COLOR)
         text_rect = text_surface.get_rect(center=TEXT_POSITION)
         utils.screen.blit(text_surface, text_rect)
@@ -662,6 +866,501 @@ class Game:
                center[1] - text_surface.get_height() // 2)
         utils.screen.blit(text_surface, pos)
 
+###############################################################################
+# Analytic backend
+###############################################################################
+class AnalyticBall:
+    def __init__(self, pos, radius, color):
+        global utils
+        self.color = color
+        self.radius = radius
+        self.pos = np.array(utils.from_Pos((pos.x, pos.y)), dtype=float)  # meters, y up
+        self.vel = np.zeros(2)
+        self.prev_pos = self.world_pos()
+
+    def world_pos(self):
+        return self.pos.copy()
+
+    def draw(self, alpha=1.0):
+        global utils
+        position = utils.to_Pos(self.prev_pos + (self.pos - self.prev_pos) * alpha)
+        pygame.draw.circle(utils.screen, self.color, [int(x) for x in position],
+                           int(self.radius * utils.PPM))
+
+    def getPos(self):
+        global utils
+        p = utils.to_Pos(self.pos)
+        return Vector2(p[0], p[1])
+
+class AnalyticRing(RingOutline):
+    # A true circle of radius self.radius whose wall covers local angles
+    # [0, arc_end]; the polygon arcs are only kept for drawing
+    def __init__(self, pos, radius, rotateDir, size, hue, angle=0.0):
+        if size != RING_SEGMENT_COUNT:
+            raise ValueError("the analytic backend only handles circular rings")
+        super().__init__(pos, radius, rotateDir, size, hue, angle)
+
+    def create_edge_shape(self):
+        super().create_edge_shape()
+        self.arc_end = (len(self.local_arcs[0]) - 1) * 2 * math.pi / self.size
+
+    def on_wall(self, direction, angle):
+        # Is the world direction (from the center) on the wall when the ring is at angle?
+        local = (math.atan2(direction[1], direction[0]) - angle) % (2 * math.pi)
+        return local <= self.arc_end
+
+    def arc_ends(self, angle):
+        # The two wall ends (world positions) and their velocities at angle
+        ends = []
+        for a in (angle, angle + self.arc_end):
+            offset = self.radius * np.array((math.cos(a), math.sin(a)))
+            ends.append((self.position + offset,
+                         self.rotateDir * np.array((-offset[1], offset[0]))))
+        return ends
+
+class AnalyticGame(Game):
+    # Same game as Game, but the ball moves against the rings analytically:
+    # time of impact with each ring's inner circle (valid only where the
+    # wall is, in the ring's rotating frame) and with the two wall ends,
+    # then reflection about the contact normal. The ball is swept over the
+    # whole step, so it can't tunnel through a wall however fast it moves.
+    def __init__(self):
+        self.touching = set()
+        super().__init__()
+
+    def make_world(self):
+        pass  # No Box2D world: gravity comes straight from utils.gravity
+
+    def make_ball(self, pos, radius, color):
+        return AnalyticBall(pos, radius, color)
+
+    def make_ring(self, pos, radius, rotateDir, size, hue, angle=0.0):
+        return AnalyticRing(pos, radius, rotateDir, size, hue, angle)
+
+    def turn_rings(self):
+        for ring in self.rings:
+            ring.angle += ring.rotateDir * utils.deltaTime()
+
+    def destroy_ring(self, ring):
+        pass
+
+    def destroy_ball(self):
+        ball_pos = self.ball.getPos()
+        self.particles.burst([(ball_pos.x, ball_pos.y)], BALL_COLOR)
+        self.ball = None
+
+    def step_physics(self):
+        dt = PHYSICS_DT
+        collision_events = 0
+        if self.ball is not None:
+            collision_events = self.move_ball(dt)
+        for ring in self.rings:
+            ring.angle += ring.rotateDir * dt
+        return collision_events
+
+    def nearby_rings(self, reach):
+        # Rings are ordered by radius; only walls within reach of the ball matter
+        dist = np.linalg.norm(self.ball.pos - self.rings[0].position) if self.rings else 0
+        for ring in self.rings:
+            if ring.radius > dist + reach:
+                break
+            yield ring
+
+    def resolve_overlap(self):
+        # Push the ball back inside walls it ended up in (rings shrink between steps)
+        ball = self.ball
+        for ring in self.nearby_rings(ball.radius):
+            inner = ring.radius - ball.radius
+            d = ball.pos - ring.position
+            dist = np.linalg.norm(d)
+            if inner < dist < ring.radius and ring.on_wall(d, ring.angle):
+                normal = d / dist
+                ball.pos = ring.position + normal * inner
+                ball.vel -= max(ball.vel @ normal, 0.0) * normal
+            for end, _ in ring.arc_ends(ring.angle):
+                gap = ball.pos - end
+                dist = np.linalg.norm(gap)
+                if 0 < dist < ball.radius:
+                    ball.pos = end + gap / dist * ball.radius
+
+    def first_impact(self, remaining, elapsed):
+        # Earliest (time, normal toward the wall, wall velocity, ring) within remaining
+        ball = self.ball
+        best = None
+        speed = np.linalg.norm(ball.vel)
+        for ring in self.nearby_rings(ball.radius + speed * remaining):
+            angle = ring.angle + ring.rotateDir * elapsed
+
+            # Inner side of the circle: when does the ball reach radius - ball radius?
+            inner = ring.radius - ball.radius
+            d = ball.pos - ring.position
+            a = ball.vel @ ball.vel
+            b = 2 * (d @ ball.vel)
+            c = d @ d - inner * inner
+            t = None
+            if c >= 0:
+                if b > 0 and ring.on_wall(d, angle):
+                    t = 0.0
+            elif a > 0:
+                t = (-b + math.sqrt(b * b - 4 * a * c)) / (2 * a)
+                hit = d + ball.vel * t
+                if t > remaining or not ring.on_wall(hit, angle + ring.rotateDir * t):
+                    t = None
+            if t is not None and (best is None or t < best[0]):
+                hit = d + ball.vel * t
+                best = (t, hit / np.linalg.norm(hit), np.zeros(2), ring)
+
+            # The wall ends, moving with the ring over the step
+            for end, end_vel in ring.arc_ends(angle):
+                w = ball.pos - end
+                rel = ball.vel - end_vel
+                a = rel @ rel
+                b = 2 * (w @ rel)
+                c = w @ w - ball.radius * ball.radius
+                t = None
+                if c <= 0:
+                    if b < 0:
+                        t = 0.0
+                elif a > 0 and b * b - 4 * a * c >= 0:
+                    t = (-b - math.sqrt(b * b - 4 * a * c)) / (2 * a)
+                    if not 0 <= t <= remaining:
+                        t = None
+                if t is not None and (best is None or t < best[0]):
+                    toward = -(w + rel * t)
+                    best = (t, toward / np.linalg.norm(toward), end_vel, ring)
+        return best
+
+    def move_ball(self, dt):
+        global utils
+        ball = self.ball
+        ball.vel += np.array(utils.gravity) * dt
+        speed = np.linalg.norm(ball.vel)
+        if speed > ANALYTIC_MAX_SPEED:
+            ball.vel *= ANALYTIC_MAX_SPEED / speed
+        self.resolve_overlap()
+
+        touching = set()
+        elapsed = 0.0
+        for _ in range(ANALYTIC_MAX_IMPACTS):
+            impact = self.first_impact(dt - elapsed, elapsed)
+            if impact is None:
+                break
+            t, normal, wall_vel, ring = impact
+            ball.pos += ball.vel * t
+            elapsed += t
+            approach = (ball.vel - wall_vel) @ normal
+            if approach > 0:
+                bounce = ANALYTIC_RESTITUTION if approach > ANALYTIC_RESTITUTION_THRESHOLD else 0.0
+                ball.vel -= (1 + bounce) * approach * normal
+            touching.add(id(ring))
+        ball.pos += ball.vel * (dt - elapsed)
+
+        # Count contacts as they begin, like BeginContact does
+        collision_events = len(touching - self.touching)
+        self.touching = touching
+        return collision_events
+
+###############################################################################
+# Ball swarm
+###############################################################################
+class BallSwarm:
+    # Every ball's position and velocity in (n, 2) arrays, meters with y up.
+    # Stands in for the single ball: world_pos/prev_pos/draw work on all of
+    # them at once. Not Box2D (its broadphase would still pair up the
+    # overlapping balls that the masks keep apart); step() is
+    # AnalyticGame.move_ball for every ball at once, with the same swept
+    # impact times, so a single ball follows the same path as there.
+    def __init__(self, count, pos, radius, color, spawn_radius=SWARM_SPAWN_RADIUS, seed=SEED):
+        global utils
+        self.color = color
+        self.radius = radius
+        rng = np.random.default_rng(seed)
+        r = spawn_radius * np.sqrt(rng.uniform(0, 1, count))
+        a = rng.uniform(0, 2 * math.pi, count)
+        center = np.array(utils.from_Pos((pos.x, pos.y)), dtype=float)
+        self.pos = center + np.column_stack((r * np.cos(a), r * np.sin(a)))
+        self.vel = np.zeros((count, 2))
+        self.touching = {}  # id(ring) -> which balls touched it last step
+        self.prev_pos = self.world_pos()
+        self.stamp = circle_stamp(int(radius * PPM))
+
+    def world_pos(self):
+        return self.pos.copy()
+
+    def screen_positions(self, pos=None):
+        pos = self.pos if pos is None else pos
+        return np.column_stack((pos[:, 0] * utils.PPM, utils.height - pos[:, 1] * utils.PPM))
+
+    def distances(self, point):
+        return np.linalg.norm(self.pos - point, axis=1)
+
+    def step(self, dt, rings):
+        # Gravity, then every ball swept through the step against the rings
+        # (innermost first), bouncing at each impact. Returns the contacts begun.
+        global utils
+        self.vel += np.array(utils.gravity) * dt
+        speed = np.linalg.norm(self.vel, axis=1)
+        fast = speed > ANALYTIC_MAX_SPEED
+        self.vel[fast] *= (ANALYTIC_MAX_SPEED / speed[fast])[:, None]
+        rings = list(rings)
+        self.resolve_overlap(rings)
+
+        touching = {}
+        elapsed = np.zeros(len(self.pos))
+        moving = np.arange(len(self.pos))  # Balls that may still hit something this step
+        for _ in range(ANALYTIC_MAX_IMPACTS):
+            if len(moving) == 0:
+                break
+            t, normal, wall_vel, ring_index = self.first_impact(
+                rings, moving, dt - elapsed[moving], elapsed[moving])
+            hit = np.isfinite(t)
+            moving, t, normal, wall_vel, ring_index = (
+                moving[hit], t[hit], normal[hit], wall_vel[hit], ring_index[hit])
+            self.pos[moving] += self.vel[moving] * t[:, None]
+            elapsed[moving] += t
+            approach = np.einsum("ij,ij->i", self.vel[moving] - wall_vel, normal)
+            bounce = np.where(approach > ANALYTIC_RESTITUTION_THRESHOLD, ANALYTIC_RESTITUTION, 0.0)
+            self.vel[moving] -= (np.where(approach > 0, (1 + bounce) * approach, 0.0))[:, None] * normal
+            for k in np.unique(ring_index):
+                key = id(rings[k])
+                touching.setdefault(key, np.zeros(len(self.pos), dtype=bool))
+                touching[key][moving[ring_index == k]] = True
+        self.pos += self.vel * (dt - elapsed)[:, None]
+
+        # Count contacts as they begin, like BeginContact does
+        collision_events = 0
+        for key, now in touching.items():
+            before = self.touching.get(key)
+            collision_events += int(now.sum() if before is None else (now & ~before).sum())
+        self.touching = touching
+        return collision_events
+
+    def resolve_overlap(self, rings):
+        # Push balls back inside walls they ended up in (rings shrink between steps)
+        if not rings:
+            return
+        dist0 = self.distances(rings[0].position)
+        for ring in rings:
+            near = ring.radius <= dist0 + self.radius
+            if not near.any():
+                break
+            inner = ring.radius - self.radius
+            d = self.pos - ring.position
+            dist = np.linalg.norm(d, axis=1)
+            inside = near & (inner < dist) & (dist < ring.radius) & on_wall(ring, d, ring.angle)
+            normal = d[inside] / dist[inside, None]
+            self.pos[inside] = ring.position + normal * inner
+            outward = np.maximum(np.einsum("ij,ij->i", self.vel[inside], normal), 0.0)
+            self.vel[inside] -= outward[:, None] * normal
+            for end, _ in ring.arc_ends(ring.angle):
+                gap = self.pos - end
+                gap_dist = np.linalg.norm(gap, axis=1)
+                inside = near & (gap_dist > 0) & (gap_dist < self.radius)
+                self.pos[inside] = end + gap[inside] / gap_dist[inside, None] * self.radius
+
+    def first_impact(self, rings, balls, remaining, elapsed):
+        # AnalyticGame.first_impact for the given balls: earliest time within
+        # remaining (inf if none), normal toward the wall, wall velocity and
+        # ring index. Ties go to the first found, in the same order.
+        pos, vel, r = self.pos[balls], self.vel[balls], self.radius
+        n = len(balls)
+        best_t = np.full(n, np.inf)
+        best_normal = np.zeros((n, 2))
+        best_wall_vel = np.zeros((n, 2))
+        best_ring = np.full(n, -1)
+        if not rings:
+            return best_t, best_normal, best_wall_vel, best_ring
+        reach = r + np.linalg.norm(vel, axis=1) * remaining
+        dist0 = np.linalg.norm(pos - rings[0].position, axis=1)
+        a = np.einsum("ij,ij->i", vel, vel)
+
+        def keep(near, t, toward, wall_vel, k):
+            better = near & (t < best_t)
+            best_t[better] = t[better]
+            best_normal[better] = toward[better] / np.linalg.norm(toward[better], axis=1)[:, None]
+            best_wall_vel[better] = wall_vel[better]
+            best_ring[better] = k
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for k, ring in enumerate(rings):
+                near = ring.radius <= dist0 + reach
+                if not near.any():
+                    break
+                angle = ring.angle + ring.rotateDir * elapsed
+
+                # Inner side of the circle: when does each ball reach radius - ball radius?
+                inner = ring.radius - r
+                d = pos - ring.position
+                b = 2 * np.einsum("ij,ij->i", d, vel)
+                c = np.einsum("ij,ij->i", d, d) - inner * inner
+                t = np.full(n, np.nan)
+                t[(c >= 0) & (b > 0) & on_wall(ring, d, angle)] = 0.0
+                root = (-b + np.sqrt(b * b - 4 * a * c)) / (2 * a)
+                hit = d + vel * root[:, None]
+                crossing = (c < 0) & (a > 0) & (root <= remaining) & \
+                    on_wall(ring, hit, angle + ring.rotateDir * root)
+                t[crossing] = root[crossing]
+                keep(near, t, d + vel * np.nan_to_num(t)[:, None], np.zeros((n, 2)), k)
+
+                # The wall ends, moving with the ring over the step
+                for end_angle in (angle, angle + ring.arc_end):
+                    offset = ring.radius * np.column_stack((np.cos(end_angle), np.sin(end_angle)))
+                    end_vel = ring.rotateDir * np.column_stack((-offset[:, 1], offset[:, 0]))
+                    w = pos - (ring.position + offset)
+                    rel = vel - end_vel
+                    ea = np.einsum("ij,ij->i", rel, rel)
+                    eb = 2 * np.einsum("ij,ij->i", w, rel)
+                    ec = np.einsum("ij,ij->i", w, w) - r * r
+                    disc = eb * eb - 4 * ea * ec
+                    t = np.full(n, np.nan)
+                    t[(ec <= 0) & (eb < 0)] = 0.0
+                    root = (-eb - np.sqrt(disc)) / (2 * ea)
+                    approaching = (ec > 0) & (ea > 0) & (disc >= 0) & (root >= 0) & (root <= remaining)
+                    t[approaching] = root[approaching]
+                    keep(near, t, -(w + rel * np.nan_to_num(t)[:, None]), end_vel, k)
+        return best_t, best_normal, best_wall_vel, best_ring
+
+    def draw(self, alpha=1.0):
+        global utils
+        pos = self.screen_positions(self.prev_pos + (self.pos - self.prev_pos) * alpha)
+        mapped = utils.screen.map_rgb(self.color)
+        pixels = pygame.surfarray.pixels2d(utils.screen)
+        stamp_pixels(pixels, pos.astype(np.int64), mapped, self.stamp)
+        del pixels  # Unlock the screen
+
+def on_wall(ring, directions, angles):
+    # AnalyticRing.on_wall for (n, 2) world directions and per-ball angles
+    local = (np.arctan2(directions[:, 1], directions[:, 0]) - angles) % (2 * math.pi)
+    return local <= ring.arc_end
+
+class SwarmGame(AnalyticGame):
+    # The analytic rings with NUM_BALLS balls in a BallSwarm (not Box2D, see
+    # BallSwarm). The balls don't touch each other; a ring pops as soon as
+    # any ball is out of it.
+    def make_ball(self, pos, radius, color):
+        return BallSwarm(NUM_BALLS, pos, SWARM_BALL_RADIUS, color, SWARM_SPAWN_RADIUS, SEED)
+
+    def destroy_ball(self):
+        self.particles.burst(self.ball.screen_positions(), BALL_COLOR)
+        self.ball = None
+
+    def step_physics(self):
+        collision_events = 0
+        if self.ball is not None:
+            collision_events = self.ball.step(PHYSICS_DT, self.rings)
+        for ring in self.rings:
+            ring.angle += ring.rotateDir * PHYSICS_DT
+        return collision_events
+
+    def ball_escaped(self):
+        return self.ball.distances(self.rings[0].position).max() > self.radii[0]
+
+    def collision_sound(self, collision_events):
+        # Some ball begins a contact nearly every step, so sound on every step
+        # with new contacts and leave the spacing to Sounds.play_interval
+        if collision_events > 0:
+            sounds.play()
+
+###############################################################################
+# Round logic
+###############################################################################
+def step_round(game, pause_time_remaining, game_timer):
+    # One fixed step of the round (utils.advance has already moved time on):
+    # the start pause, then the timer, win/lose and the game update
+    global utils, sounds
+    dt = utils.deltaTime()
+    if pause_time_remaining > 0:
+        return pause_time_remaining - dt, game_timer
+    if not game.game_over and not game.win:
+        if len(game.rings) == 0:
+            game.win = True
+        else:
+            game_timer -= dt
+            if game_timer <= 0 and not game.game_over:
+                if game.ball is not None:
+                    game.destroy_ball()
+                    sounds.playDestroySound()
+                game.game_over = True
+    game.update()
+    return pause_time_remaining, game_timer
+
+def make_game():
+    if NUM_BALLS > 1:
+        return SwarmGame()
+    return AnalyticGame() if PHYSICS_BACKEND == "analytic" else Game()
+
+###############################################################################
+# Headless seed search
+###############################################################################
+def run_headless(settings):
+    # Play one round with the given constant overrides (e.g. {"SEED": 7}) as
+    # fast as the physics allows, with no window, sound or drawing; the round
+    # runs the same fixed steps as main
+    global utils, sounds
+    defaults = {name: globals()[name] for name in settings}
+    globals().update(settings)
+    globals().update(derived_constants())
+    try:
+        random.seed(SEED)
+        utils = Utils(headless=True)
+        sounds = NoSounds()
+        game = make_game()
+        pause_time_remaining = INITIAL_PAUSE_TIME
+        game_timer = TIMER_DURATION
+        pop_times = []
+        while not (game.game_over or game.win):
+            utils.advance(PHYSICS_DT)
+            popped_before = game.rings_popped
+            pause_time_remaining, game_timer = step_round(game, pause_time_remaining, game_timer)
+            pop_times += [round(TIMER_DURATION - game_timer, 3)] * (game.rings_popped - popped_before)
+
+        return {
+            "settings": settings,
+            "win": game.win,
+            "rings_popped": len(pop_times),
+            "pop_times": pop_times,
+            "bounces": game.collision_count,
+            "time_left": round(max(game_timer, 0), 3),
+        }
+    finally:
+        globals().update(defaults)
+        globals().update(derived_constants())
+
+def derived_constants():
+    # Constants computed from other constants, redone after overrides
+    return {
+        "PHYSICS_DT": 1.0 / PHYSICS_HZ,
+        "BALL_MASK": ball_mask(BALLS_COLLIDE),
+    }
+
+def search_seeds(seeds=None, overrides=None, workers=None):
+    # Every seed crossed with every combination of override values
+    # (e.g. {"GRAVITY_MAG": [90, 95]}), one headless round per process task.
+    # SEED only places the swarm's balls, so single-ball searches skip it
+    # unless seeds are passed in.
+    overrides = SEARCH_OVERRIDES if overrides is None else overrides
+    workers = SEARCH_WORKERS if workers is None else workers
+    if seeds is None:
+        seeds = SEARCH_SEEDS if NUM_BALLS > 1 or "NUM_BALLS" in overrides else [None]
+    names = list(overrides)
+    runs = []
+    for seed, *values in itertools.product(seeds, *(overrides[name] for name in names)):
+        settings = {} if seed is None else {"SEED": seed}
+        settings.update(zip(names, values))
+        runs.append(settings)
+    with mp.Pool(workers) as pool:
+        return pool.map(run_headless, runs)
+
+def search_main():
+    results = search_seeds()
+    for result in sorted(results, key=lambda r: (not r["win"], -r["rings_popped"], -r["time_left"])):
+        settings = ", ".join(f"{name}={value}" for name, value in result["settings"].items())
+        outcome = "WIN " if result["win"] else "lose"
+        last_pop = result["pop_times"][-1] if result["pop_times"] else "-"
+        total = "inf" if INFINITE_RINGS else NUM_RINGS
+        print(f"{outcome} {settings}: {result['rings_popped']}/{total} rings, "
+              f"{result['bounces']} bounces, last pop {last_pop}s, {result['time_left']}s left")
+
 ###############################################################################
 # Main Loop
 ###############################################################################
@@ -669,10 +1368,11 @@ def main():
     global utils, sounds
     utils = Utils()
     sounds = Sounds()
-    game = Game()
+    game = make_game()
 
     pause_time_remaining = INITIAL_PAUSE_TIME
     game_timer = TIMER_DURATION
+    accumulator = 0.0
 
     while True:
         for event in pygame.event.get():
@@ -684,38 +1384,25 @@ def main():
                     pygame.quit()
                     return
 
-        if SOUND_OPTION == 2:
-            sounds.update()
+        # Physics, rotation, shrink and the timer advance in fixed steps;
+        # drawing happens once per frame, in between the last two steps
+        steps, accumulator = fixed_steps(accumulator + utils.calDeltaTime(), PHYSICS_DT,
+                                         MAX_STEPS_PER_FRAME)
+        for _ in range(steps):
+            utils.advance(PHYSICS_DT)
+            pause_time_remaining, game_timer = step_round(game, pause_time_remaining, game_timer)
+        alpha = accumulator / PHYSICS_DT
 
-        utils.calDeltaTime()
         utils.screen.fill(SCREEN_BACKGROUND_COLOR)
-
         if pause_time_remaining > 0:
-            pause_time_remaining -= utils.deltaTime()
             game.draw(paused=True, timer_value=TIMER_DURATION)
         else:
-            if not game.game_over and not game.win:
-                if len(game.rings) == 0:
-                    game.win = True
-                else:
-                    game_timer -= utils.deltaTime()
-                    if game_timer <= 0 and not game.game_over:
-                        if game.ball is not None:
-                            ball_pos = game.ball.getPos()
-                            explosion = Explosion(ball_pos.x, ball_pos.y, BALL_COLOR)
-                            game.particles.append(explosion)
-                            utils.world.DestroyBody(game.ball.circle_body)
-                            game.ball = None
-                            sounds.playDestroySound()
-                        game.game_over = True
-
-            if game.game_over or game.win:
-                game.draw(paused=False, timer_value=game_timer)
-            else:
-                game.update()
-                game.draw(paused=False, timer_value=game_timer)
+            game.draw(paused=False, timer_value=game_timer, alpha=alpha)
 
         pygame.display.flip()
 
 if __name__ == "__main__":
-    main()
+    if HEADLESS_SEARCH:
+        search_main()
+    else:
+        main()
@@ -0,0 +1,39 @@
+import pygame
+import numpy as np
+
+# Collision song snippets (SOUND_OPTION 2), shared by Sim3, Sim4 and tester
+
+class SongSnippets:
+    """
+    A song decoded once to PCM. Each play() takes the next snippet_duration
+    slice of it (a view, no decoding or seeking), fades its edges and plays it
+    as its own Sound, so snippets start at once and can overlap.
+    """
+    def __init__(self, path, snippet_duration, fade_ms, volume=1.0):
+        self.song = pygame.mixer.Sound(path)  # Decodes the whole file in the mixer's format
+        self.samples = pygame.sndarray.samples(self.song)  # View on the decoded PCM
+        rate = pygame.mixer.get_init()[0]
+        self.snippet_len = min(int(snippet_duration * rate), len(self.samples))
+        fade_len = min(int(fade_ms * rate / 1000), self.snippet_len // 2)
+        self.envelope = np.ones(self.snippet_len, dtype=np.float32)
+        if fade_len > 0:
+            ramp = np.linspace(0.0, 1.0, fade_len, endpoint=False, dtype=np.float32)
+            self.envelope[:fade_len] = ramp
+            self.envelope[-fade_len:] = ramp[::-1]
+        if self.samples.ndim > 1:
+            self.envelope = self.envelope[:, np.newaxis]
+        self.volume = volume
+        self.pos = 0
+        self.playing = []  # (channel, sound) pairs; a Sound stops if it's freed mid-play
+
+    def play(self):
+        if self.pos + self.snippet_len > len(self.samples):
+            self.pos = 0  # Wrap to the start of the song
+        snippet = self.samples[self.pos:self.pos + self.snippet_len]
+        self.pos += self.snippet_len
+        sound = pygame.sndarray.make_sound((snippet * self.envelope).astype(self.samples.dtype))
+        sound.set_volume(self.volume)
+        self.playing = [(c, s) for c, s in self.playing if c.get_busy() and c.get_sound() is s]
+        channel = sound.play()
+        if channel is not None:
+            self.playing.append((channel, sound))
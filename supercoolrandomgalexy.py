@@ -1,9 +1,14 @@
 import math
 import random
+from collections import deque
 import colorsys
 import pygame
 from pygame import Vector2, DOUBLEBUF, mixer
-from Box2D import b2World, b2ContactListener, b2EdgeShape
+from Box2D import b2World, b2EdgeShape
+import numpy as np
+from RingGame import (
+    CATEGORY_BALL, CATEGORY_RING, RING_MASK, ball_mask, MyContactListener, fixed_steps,
+    ParticlePool)
 
 ###############################################################################
 # CONFIGURABLE VARIABLES
@@ -19,6 +24,9 @@ SCREEN_BACKGROUND_COLOR = (23, 23, 23)
 # Physics and Pygame updates
 FRAMERATE = 60
 PPM = 10.0  # Pixels per meter
+PHYSICS_HZ = 60            # Fixed physics steps per second, independent of FRAMERATE
+PHYSICS_DT = 1.0 / PHYSICS_HZ
+MAX_STEPS_PER_FRAME = 8    # After a longer stall the backlog is dropped instead of caught up
 
 # Gravity will be made to "bounce around" rather than just going straight down
 GRAVITY_MAG = 20        # Gravity magnitude
@@ -28,6 +36,9 @@ GRAVITY_ROT_SPEED = 0.5 # How fast gravity rotates
 BALL_RADIUS = 1
 BALL_COLOR = (255, 255, 255)
 
+BALLS_COLLIDE = False  # Balls touch each other too (see RingGame's collision filtering)
+BALL_MASK = ball_mask(BALLS_COLLIDE)
+
 # Rings settings
 NUM_RINGS = 12
 INITIAL_RING_RADIUS = 5
@@ -53,29 +64,11 @@ PARTICLE_SPEED_MIN = 0.1
 PARTICLE_SPEED_MAX = 1
 PARTICLE_LIFE_MIN = 100
 PARTICLE_LIFE_MAX = 1000
+PARTICLE_POOL_SIZE = 20000  # Live particles at once; the oldest are recycled past this
 
 # Initialize the random seed
 random.seed(SEED)
 
-###############################################################################
-# MyContactListener
-###############################################################################
-class MyContactListener(b2ContactListener):
-    def __init__(self):
-        super(MyContactListener, self).__init__()
-        self.collisions = []
-
-    def BeginContact(self, contact):
-        fixtureA = contact.fixtureA
-        fixtureB = contact.fixtureB
-        bodyA = fixtureA.body
-        bodyB = fixtureB.body
-
-        # Check if one of the fixtures is the ring and the other is the ball
-        if (isinstance(bodyA.userData, Ring) and isinstance(bodyB.userData, Ball)) \
-           or (isinstance(bodyA.userData, Ball) and isinstance(bodyB.userData, Ring)):
-            self.collisions.append((bodyA, bodyB))
-
 ###############################################################################
 # Utils
 ###############################################################################
@@ -87,7 +80,8 @@ class Utils:
 
         self.screen = pygame.display.set_mode((self.width, self.height), DOUBLEBUF, 16)
 
-        self.dt = 0
+        self.dt = 0        # Game time per physics step
+        self.frame_dt = 0  # Real time per rendered frame
         self.clock = pygame.time.Clock()
 
         self.PPM = PPM  # Pixels per meter
@@ -109,9 +103,13 @@ class Utils:
         return (pos[0] / self.PPM, (self.height - pos[1]) / self.PPM)
 
     def calDeltaTime(self):
-        # calculate deltaTime
+        # calculate the real frame time; game time only moves in advance()
         t = self.clock.tick(FRAMERATE)
-        self.dt = t / 1000
+        self.frame_dt = t / 1000
+        return self.frame_dt
+
+    def advance(self, dt):
+        self.dt = dt
 
         # Rotate gravity so it moves around in a circle
         self.gravityAngle += GRAVITY_ROT_SPEED * self.dt
@@ -138,19 +136,26 @@ class Ball:
         self.radius = radius
         self.circle_body = utils.world.CreateDynamicBody(position=utils.from_Pos((pos.x, pos.y)))
         self.circle_shape = self.circle_body.CreateCircleFixture(
-            radius=self.radius, density=1, friction=0.0, restitution=1.0
+            radius=self.radius, density=1, friction=0.0, restitution=1.0,
+            categoryBits=CATEGORY_BALL, maskBits=BALL_MASK
         )
         self.circle_body.userData = self
-        self.destroyFlag = False
+        self.prev_pos = self.world_pos()
+
+    def world_pos(self):
+        return self.circle_body.position.copy()
 
-    def draw(self):
+    def draw(self, alpha=1.0):
         global utils
         for fixture in self.circle_body.fixtures:
-            self.draw_circle(fixture.shape, self.circle_body, fixture)
+            self.draw_circle(fixture.shape, self.circle_body, fixture, alpha)
 
-    def draw_circle(self, circle, body, fixture):
+    def draw_circle(self, circle, body, fixture, alpha=1.0):
         global utils
-        position = utils.to_Pos(body.transform * circle.pos)
+        # Between the last two physics steps, alpha of the way to the current one
+        current = body.transform * circle.pos
+        previous = self.prev_pos + circle.pos
+        position = utils.to_Pos(previous + (current - previous) * alpha)
         pygame.draw.circle(utils.screen, self.color, [int(x) for x in position],
                            int(circle.radius * utils.PPM))
 
@@ -159,55 +164,6 @@ class Ball:
         p = utils.to_Pos(self.circle_body.position)
         return Vector2(p[0], p[1])
 
-###############################################################################
-# Particle and Explosion
-###############################################################################
-class Particle:
-    def __init__(self, x, y, color):
-        # Size
-        self.radius = random.uniform(PARTICLE_SIZE_MIN, PARTICLE_SIZE_MAX)
-
-        # Direction and speed
-        angle = random.uniform(PARTICLE_ANGLE_MIN, PARTICLE_ANGLE_MAX)
-        speed = random.uniform(PARTICLE_SPEED_MIN, PARTICLE_SPEED_MAX)
-
-        self.x = x
-        self.y = y
-        self.color = color
-        self.vel_x = math.cos(math.radians(angle)) * speed
-        self.vel_y = math.sin(math.radians(angle)) * speed
-
-        # Lifetime
-        self.life = random.randint(PARTICLE_LIFE_MIN, PARTICLE_LIFE_MAX)
-
-    def update(self):
-        self.x += self.vel_x
-        self.y += self.vel_y
-        self.life -= 1
-
-    def draw(self, screen):
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), int(self.radius))
-
-class Explosion:
-    def __init__(self, x, y, color):
-        # Create particles
-        self.particles = []
-        COLORS = [color]  # can expand if desired
-        for _ in range(PARTICLE_COUNT):
-            chosen_color = random.choice(COLORS)
-            particle = Particle(x, y, chosen_color)
-            self.particles.append(particle)
-
-    def update(self):
-        for particle in self.particles:
-            particle.update()
-        self.particles = [p for p in self.particles if p.life > 0]
-
-    def draw(self):
-        global utils
-        for particle in self.particles:
-            particle.draw(utils.screen)
-
 ###############################################################################
 # Ring
 ###############################################################################
@@ -225,12 +181,14 @@ class Ring:
             y = radius * math.sin(angle)
             self.vertices.append((x, y))
 
-        self.body = utils.world.CreateStaticBody(position=utils.from_Pos(pos))
+        # Kinematic so the solver turns the ring (rotateDir rad/s) during world.Step
+        self.body = utils.world.CreateKinematicBody(position=utils.from_Pos(pos),
+                                                    angularVelocity=rotateDir)
         self.body.userData = self
+        self.prev_angle = self.body.angle
 
         self.create_edge_shape()
         self.hue = hue
-        self.destroyFlag = False
 
     def create_edge_shape(self):
         # Keeping the original logic intact:
@@ -243,7 +201,8 @@ class Ring:
                     v2 = self.vertices[(i + 1) % self.size]
                     edge = b2EdgeShape(vertices=[v1, v2])
                     self.body.CreateEdgeFixture(
-                        shape=edge, density=1, friction=0.0, restitution=1.0
+                        shape=edge, density=1, friction=0.0, restitution=1.0,
+                        categoryBits=CATEGORY_RING, maskBits=RING_MASK
                     )
         if self.size == TRIANGLE_SIZE or self.size == SQUARE_SIZE:
             for i in range(self.size):
@@ -258,47 +217,49 @@ class Ring:
 
                     edge = b2EdgeShape(vertices=[v1, mV1])
                     self.body.CreateEdgeFixture(
-                        shape=edge, density=1, friction=0.0, restitution=1.0
+                        shape=edge, density=1, friction=0.0, restitution=1.0,
+                        categoryBits=CATEGORY_RING, maskBits=RING_MASK
                     )
 
                     edge = b2EdgeShape(vertices=[mV2, v2])
                     self.body.CreateEdgeFixture(
-                        shape=edge, density=1, friction=0.0, restitution=1.0
+                        shape=edge, density=1, friction=0.0, restitution=1.0,
+                        categoryBits=CATEGORY_RING, maskBits=RING_MASK
                     )
                 else:
                     v1 = self.vertices[i]
                     v2 = self.vertices[(i + 1) % self.size]
                     edge = b2EdgeShape(vertices=[v1, v2])
                     self.body.CreateEdgeFixture(
-                        shape=edge, density=1, friction=0.0, restitution=1.0
+                        shape=edge, density=1, friction=0.0, restitution=1.0,
+                        categoryBits=CATEGORY_RING, maskBits=RING_MASK
                     )
 
-    def draw(self):
+    def draw(self, alpha=1.0):
         global utils
-        self.hue = (self.hue + utils.deltaTime() / 5) % 1
+        self.hue = (self.hue + utils.frame_dt / 5) % 1
         self.color = utils.hueToRGB(self.hue)
+        self.draw_edges(alpha)
 
-        self.body.angle += self.rotateDir * utils.deltaTime()
-        self.draw_edges()
-
-    def draw_edges(self):
+    def draw_edges(self, alpha=1.0):
         global utils
+        # Rotate by the angle alpha of the way from the previous physics step
+        angle = self.prev_angle + (self.body.angle - self.prev_angle) * alpha
+        cos, sin = math.cos(angle), math.sin(angle)
+        px, py = self.body.position
         for fixture in self.body.fixtures:
-            v1 = utils.to_Pos(self.body.transform * fixture.shape.vertices[0])
-            v2 = utils.to_Pos(self.body.transform * fixture.shape.vertices[1])
+            (x1, y1), (x2, y2) = fixture.shape.vertices
+            v1 = utils.to_Pos((px + cos * x1 - sin * y1, py + sin * x1 + cos * y1))
+            v2 = utils.to_Pos((px + cos * x2 - sin * y2, py + sin * x2 + cos * y2))
             pygame.draw.line(utils.screen, self.color, v1, v2, RING_LINE_THICKNESS)
 
-    def spawParticles(self):
+    def spawParticles(self, pool):
         global utils
-        particles = []
-        center = Vector2(utils.width / 2, utils.height / 2)
-        for i in range(0, 360, 5):
-            x = math.cos(math.radians(i)) * self.radius * 10
-            y = math.sin(math.radians(i)) * self.radius * 10
-            pos = center + Vector2(x, y)
-            exp = Explosion(pos.x, pos.y, self.color)
-            particles.append(exp)
-        return particles
+        # One burst every 5 degrees around the destroyed ring
+        angles = np.radians(np.arange(0, 360, 5))
+        centers = np.column_stack((utils.width / 2 + np.cos(angles) * self.radius * 10,
+                                   utils.height / 2 + np.sin(angles) * self.radius * 10))
+        pool.burst(centers, self.color)
 
 ###############################################################################
 # Sounds
@@ -350,8 +311,15 @@ class Game:
         self.center = Vector2(utils.width / 2, utils.height / 2)
         self.ball = Ball(Vector2(utils.width / 2, utils.height / 2),
                          BALL_RADIUS, BALL_COLOR)
-        self.particles = []
-        self.rings = []
+        self.particles = ParticlePool(PARTICLE_POOL_SIZE, SEED, PARTICLE_COUNT,
+                                      (PARTICLE_SIZE_MIN, PARTICLE_SIZE_MAX),
+                                      (PARTICLE_ANGLE_MIN, PARTICLE_ANGLE_MAX),
+                                      (PARTICLE_SPEED_MIN, PARTICLE_SPEED_MAX),
+                                      (PARTICLE_LIFE_MIN, PARTICLE_LIFE_MAX))
+        # Innermost ring first; only the front one can ever be destroyed
+        self.rings = deque()
+        # Pixel distance from the center at which the ball escapes each ring
+        self.escape_radii = deque()
 
         # Create rings based on configurable variables
         radius = INITIAL_RING_RADIUS
@@ -364,48 +332,45 @@ class Game:
             rotateSpeed *= ROTATION_SPEED_MULTIPLIER
             hue += 1 / NUM_RINGS
             self.rings.append(ring)
+            self.escape_radii.append(ring.radius * PPM)
+
+    def save_previous(self):
+        # Poses before this step, for drawing in between steps
+        for ring in self.rings:
+            ring.prev_angle = ring.body.angle
+        self.ball.prev_pos = self.ball.world_pos()
 
     def update(self):
         global utils
         global sounds
 
-        utils.world.Step(1.0 / 60.0, 6, 2)
+        self.save_previous()
+        utils.world.Step(PHYSICS_DT, 6, 2)
 
         # check collisions
-        if utils.contactListener:
-            for bodyA, bodyB in utils.contactListener.collisions:
-                sounds.play()
-                break
-            utils.contactListener.collisions = []
+        if utils.contactListener.take_count():
+            sounds.play()
 
         # ring destruction logic
-        if len(self.rings) > 0:
-            # if ball is outside the ring radius => destroy ring
-            if self.center.distance_to(self.ball.getPos()) > self.rings[0].radius * 10:
-                self.rings[0].destroyFlag = True
-                utils.world.DestroyBody(self.rings[0].body)
-
-        # spawn ring explosion if destroyed
-        for ring in self.rings:
-            if ring.destroyFlag:
-                self.particles += ring.spawParticles()
-                self.rings.remove(ring)
+        if self.rings:
+            # if ball is outside the innermost ring => destroy it and spawn its explosion
+            if self.center.distance_to(self.ball.getPos()) > self.escape_radii[0]:
+                ring = self.rings.popleft()
+                self.escape_radii.popleft()
+                utils.world.DestroyBody(ring.body)
+                ring.spawParticles(self.particles)
                 sounds.playDestroySound()
 
         # update ring explosion particles
-        for exp in self.particles:
-            exp.update()
-            if len(exp.particles) == 0:
-                self.particles.remove(exp)
+        self.particles.update(utils.deltaTime() * FRAMERATE)
 
-    def draw(self):
+    def draw(self, alpha=1.0):
         global utils
         for ring in self.rings:
-            ring.draw()
-        self.ball.draw()
+            ring.draw(alpha)
+        self.ball.draw(alpha)
 
-        for exp in self.particles:
-            exp.draw()
+        self.particles.draw(utils.screen)
 
 ###############################################################################
 # Main Loop
@@ -419,18 +384,24 @@ def main():
     sounds = Sounds()
 
     game = Game()
+    accumulator = 0.0
 
     while True:
         utils.screen.fill(SCREEN_BACKGROUND_COLOR)
-        utils.calDeltaTime()
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 return
 
-        game.update()
-        game.draw()
+        # Gravity and physics advance in fixed steps; draw in between the last two
+        steps, accumulator = fixed_steps(accumulator + utils.calDeltaTime(), PHYSICS_DT,
+                                         MAX_STEPS_PER_FRAME)
+        for _ in range(steps):
+            utils.advance(PHYSICS_DT)
+            game.update()
+
+        game.draw(accumulator / PHYSICS_DT)
 
         pygame.display.flip()
 
@@ -0,0 +1,31 @@
+import numpy as np
+
+from GameOfLifePacked import (
+    random_board, GRID_WIDTH, GRID_HEIGHT, INITIAL_LIVE_CHANCE, INITIAL_TOGGLE_RATE, SEED
+)
+from GameOfLifeHistory import BoardHistory, PLANES
+
+GENERATIONS = 30
+
+
+def test_history_is_compact_and_exact_on_demo_board():
+    rng = np.random.default_rng(SEED)
+    board = random_board(GRID_WIDTH, GRID_HEIGHT, INITIAL_LIVE_CHANCE, rng)
+    history = BoardHistory(board)
+    full_copy = sum(getattr(board, plane).nbytes for plane in PLANES)
+
+    snapshots = {}
+    for _ in range(GENERATIONS):
+        board.step(SEED, INITIAL_TOGGLE_RATE)
+        history.record(board)
+        if board.generation % 10 == 0:
+            snapshots[board.generation] = board.copy()
+
+    ratios = [history.stored_bytes(g) / full_copy for g in range(1, GENERATIONS + 1)]
+    assert max(ratios) < 0.6
+    assert np.mean(ratios) < 0.45
+
+    for generation, expected in snapshots.items():
+        rebuilt = history.board_at(generation)
+        for plane in PLANES:
+            assert np.array_equal(getattr(rebuilt, plane), getattr(expected, plane))
@@ -2,6 +2,7 @@ import os
 import pygame
 import random
 import math  # Needed for cos/sin
+from SongSnippets import SongSnippets
 
 # ------------------------------------------------------------------------
 # Configuration
@@ -82,10 +83,7 @@ START_VOLUME_PERCENT = 40
 SOUND_OPTION = 1
 COLLISION_SONG_PATH = "TMOTTBG.mp3"
 SOUND_SNIPPET_DURATION = 0.1
-SOUND_FADEOUT_MS = 20
-COLLISION_SONG_TOTAL_DURATION = 180.0
-collision_song_pos = 0.0
-COLLISION_SNIPPET_STOP_EVENT = pygame.USEREVENT + 1
+SOUND_FADE_MS = 20
 
 # ------------------------------------------------------------------------
 # Pygame Init
@@ -121,9 +119,10 @@ if os.path.exists("start.wav"):
     start_sound = pygame.mixer.Sound("start.wav")
     start_sound.set_volume(START_VOLUME_PERCENT / 100.0)
 
+collision_song = None
 if SOUND_OPTION == 2:
     if os.path.exists(COLLISION_SONG_PATH):
-        pygame.mixer.music.load(COLLISION_SONG_PATH)
+        collision_song = SongSnippets(COLLISION_SONG_PATH, SOUND_SNIPPET_DURATION, SOUND_FADE_MS)
     else:
         print("Collision song file not found!")
 
@@ -305,7 +304,6 @@ class Item:
         return distance_sq < (combined_radius * combined_radius)
 
     def resolve_collision(self, other, current_time, to_remove, pop_events):
-        global last_collision_sound_tick, collision_song_pos
         is_self_bubble = (self.color == LOGIC_COLOR1)
         is_other_bubble = (other.color == LOGIC_COLOR1)
         is_self_spike = (self.color == LOGIC_COLOR2)
@@ -314,17 +312,24 @@ class Item:
         if is_self_bubble and is_other_spike:
             to_remove.add(self)
             pop_events.append((self.x, self.y))
-            current_tick = pygame.time.get_ticks()
-            if collision_sound and current_tick - last_collision_sound_tick > SOUND_COOLDOWN_MS:
-                collision_sound.play()
-                last_collision_sound_tick = current_tick
+            play_pop_sound()
         elif is_other_bubble and is_self_spike:
             to_remove.add(other)
             pop_events.append((other.x, other.y))
-            current_tick = pygame.time.get_ticks()
-            if collision_sound and current_tick - last_collision_sound_tick > SOUND_COOLDOWN_MS:
-                collision_sound.play()
-                last_collision_sound_tick = current_tick
+            play_pop_sound()
+
+def play_pop_sound():
+    # The collision sound, or the next song snippet for SOUND_OPTION 2
+    global last_collision_sound_tick
+    current_tick = pygame.time.get_ticks()
+    if current_tick - last_collision_sound_tick <= SOUND_COOLDOWN_MS:
+        return
+    if SOUND_OPTION == 1 and collision_sound:
+        collision_sound.play()
+        last_collision_sound_tick = current_tick
+    elif SOUND_OPTION == 2 and collision_song:
+        collision_song.play()
+        last_collision_sound_tick = current_tick
 
 # ------------------------------------------------------------------------
 # Create Items
@@ -431,7 +436,6 @@ def determine_initial_dominance():
 # Main
 # ------------------------------------------------------------------------
 def main():
-    global collision_song_pos
     determine_initial_dominance()
     items = create_items(TEAM1_COUNT, TEAM2_COUNT, seed=SEED)
     clock = pygame.time.Clock()
@@ -508,12 +512,6 @@ def main():
         for event in pygame.event.get():
             if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
                 running = False
-            elif event.type == COLLISION_SNIPPET_STOP_EVENT:
-                pygame.mixer.music.fadeout(SOUND_FADEOUT_MS)
-                pygame.time.set_timer(COLLISION_SNIPPET_STOP_EVENT, 0)
-                collision_song_pos += SOUND_SNIPPET_DURATION
-                if collision_song_pos >= COLLISION_SONG_TOTAL_DURATION:
-                    collision_song_pos = 0.0
 
         grid = spatial_partitioning(items)
         check_collisions(grid, current_ticks, items, explosions)